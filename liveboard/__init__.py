@@ -0,0 +1 @@
+# Exit Ticket Live Board 공용 모듈 (DB 접근 등)
@@ -0,0 +1,65 @@
+"""
+학사 일정 기반 주차 계산.
+
+학기 시작일(의 주 월요일)부터 7일 단위로 주차를 나누되, 평일(월~금)이 모두 휴일인 주는
+수업 주차로 세지 않고 건너뜁니다. 계산된 주차 경계는 DB의 academic_weeks 테이블에 저장되어
+제출 시점(INSERT)과 과거 데이터 일괄 보정(UPDATE)에 그대로 쓰입니다.
+"""
+from bisect import bisect_right
+from datetime import date, timedelta
+
+TERM_WEEKS = 17
+
+
+def build_weeks(term_start: date, holidays=(), weeks: int = TERM_WEEKS) -> list[tuple[int, str, str]]:
+    """
+    학기 주차 경계를 계산합니다.
+    반환: [(주차, 시작일 'YYYY-MM-DD', 종료일 'YYYY-MM-DD'), ...]  — 시작일은 월요일, 종료일은 일요일
+    """
+    holidays = set(holidays)
+    monday = term_start - timedelta(days=term_start.weekday())
+    result = []
+    # 휴일 주가 끝없이 이어지는 잘못된 입력에 대비한 상한
+    for _ in range(weeks * 3):
+        if len(result) >= weeks:
+            break
+        weekdays = [monday + timedelta(days=i) for i in range(5)]
+        if not all(d in holidays for d in weekdays):
+            result.append((len(result) + 1, monday.isoformat(), (monday + timedelta(days=6)).isoformat()))
+        monday += timedelta(days=7)
+    return result
+
+
+def parse_holidays(text: str) -> list[date]:
+    """'YYYY-MM-DD' 또는 'YYYY-MM-DD ~ YYYY-MM-DD'를 한 줄에 하나씩 적은 텍스트를 날짜 목록으로 변환."""
+    days = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if "~" in line:
+            start, end = (date.fromisoformat(part.strip()) for part in line.split("~", 1))
+            days.extend(start + timedelta(days=i) for i in range((end - start).days + 1))
+        else:
+            days.append(date.fromisoformat(line))
+    return days
+
+
+class WeekIndex:
+    """주차 경계 목록으로 날짜→주차를 이진 탐색하는 조회 객체 (여러 날짜를 한 번에 변환)."""
+
+    def __init__(self, weeks: list[tuple[int, str, str]]):
+        rows = sorted(weeks, key=lambda r: r[1])
+        self._starts = [r[1] for r in rows]
+        self._rows = rows
+
+    def week_for(self, day: str | date) -> int | None:
+        key = day.isoformat() if isinstance(day, date) else str(day)[:10]
+        i = bisect_right(self._starts, key) - 1
+        if i < 0:
+            return None
+        week, _start, end = self._rows[i]
+        return week if key <= end else None
+
+    def weeks_for(self, days) -> list[int | None]:
+        return [self.week_for(d) for d in days]
@@ -0,0 +1,155 @@
+"""
+AI(외부 API) 호출 관문: 같은 요청 합치기 + 호출 속도 제한 + 동시 호출 수 제한.
+
+교사가 "퀴즈 버튼 누르세요"라고 하면 수십 개 세션이 같은 순간에 같은 퀴즈를 요청합니다.
+st.cache_data는 아직 끝나지 않은 호출을 합쳐 주지 않으므로, 세션마다 같은 요청을 따로 보냅니다.
+
+- single-flight: 같은 키의 작업이 진행 중이면 새로 보내지 않고 그 Future를 같이 기다림
+- 토큰 버킷: 분당 RATE_PER_MINUTE번, 순간 최대 BURST번까지만 작업 시작
+- 작업 스레드 MAX_CONCURRENT개: 동시에 나가는 호출 수 제한 (나머지는 대기열)
+- 실패한 작업은 지터를 둔 백오프 후 최대 RETRIES번 다시 시도 (시도마다 토큰 하나)
+
+작업 하나는 외부 호출을 최대 한 번 하는 단위로 만드세요. (토큰은 시도마다 하나씩 씀)
+기다리는 세션은 state(key)로 "queued"(대기열) / "throttled"(속도 제한 대기) / "running"을 볼 수 있습니다.
+"""
+import atexit
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+MAX_CONCURRENT = 4
+RATE_PER_MINUTE = 30
+BURST = 6
+RETRIES = 2
+RETRY_BASE_SECONDS = 1.0
+BACKLOG_LIMIT = 8       # 대기 중인 작업이 이만큼 쌓이면 새 요청은 AI 대신 템플릿 퀴즈로 (over_budget)
+
+
+class TokenBucket:
+    """rate_per_minute 속도로 채워지고 최대 burst개까지 쌓이는 토큰 버킷."""
+
+    def __init__(self, rate_per_minute: float = RATE_PER_MINUTE, burst: int = BURST):
+        self.rate = rate_per_minute / 60
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """토큰 하나를 쓸 때까지 기다립니다. 반환: 기다린 시간 (초)"""
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - started
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AIGate:
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT, rate_per_minute: float = RATE_PER_MINUTE, burst: int = BURST,
+                 retries: int = RETRIES):
+        self.retries = max(0, retries)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrent), thread_name_prefix="liveboard-ai")
+        self._bucket = TokenBucket(rate_per_minute, burst)
+        self._lock = threading.RLock()
+        self._inflight: dict = {}      # key -> Future
+        self._state: dict = {}         # key -> "queued" | "throttled" | "running"
+        self.submitted = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.retried = 0
+        self.throttle_wait = 0.0
+
+    def submit(self, key, fn, *args, **kwargs) -> Future:
+        """key가 같은 작업이 진행 중이면 그 Future를, 아니면 새 작업의 Future를 반환합니다."""
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut
+            self.submitted += 1
+            self._state[key] = "queued"
+            fut = self._executor.submit(self._run, key, fn, args, kwargs)
+            self._inflight[key] = fut
+
+        def _done(f: Future, key=key):
+            with self._lock:
+                if self._inflight.get(key) is f:
+                    del self._inflight[key]
+                    self._state.pop(key, None)
+                if not f.cancelled() and f.exception() is not None:
+                    self.failed += 1
+
+        fut.add_done_callback(_done)
+        return fut
+
+    def _run(self, key, fn, args, kwargs):
+        for attempt in range(self.retries + 1):
+            with self._lock:
+                self._state[key] = "throttled"
+            waited = self._bucket.acquire()
+            with self._lock:
+                self.throttle_wait += waited
+                self._state[key] = "running"
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                # 시간 초과/일시적인 API 오류/잘못된 JSON 등: 정해진 횟수만 다시 시도
+                if attempt == self.retries:
+                    raise
+                with self._lock:
+                    self.retried += 1
+                    self._state[key] = "queued"
+                delay = RETRY_BASE_SECONDS * 2 ** attempt
+                time.sleep(random.uniform(delay / 2, delay))
+
+    def state(self, key) -> str | None:
+        """진행 중인 작업의 상태 (끝났거나 없는 키면 None)."""
+        with self._lock:
+            return self._state.get(key)
+
+    def over_budget(self, backlog: int = BACKLOG_LIMIT) -> bool:
+        """아직 시작하지 못한 작업이 backlog개 이상이면 True (새 요청은 한참 기다려야 함)."""
+        with self._lock:
+            waiting = sum(1 for s in self._state.values() if s != "running")
+        return waiting >= backlog
+
+    def stats(self) -> dict:
+        with self._lock:
+            states = list(self._state.values())
+            return {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "failed": self.failed,
+                "retried": self.retried,
+                "throttle_wait_seconds": round(self.throttle_wait, 2),
+                "queued": states.count("queued") + states.count("throttled"),
+                "running": states.count("running"),
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_gate: AIGate | None = None
+_gate_lock = threading.Lock()
+
+
+def get_ai_gate() -> AIGate:
+    """프로세스 전체에서 공유하는 AI 호출 관문."""
+    global _gate
+    if _gate is None:
+        with _gate_lock:
+            if _gate is None:
+                _gate = AIGate()
+                atexit.register(_gate.close)
+    return _gate
@@ -0,0 +1,79 @@
+"""
+끝난 주차를 보관 DB로 옮기는 정리(compaction) 작업.
+
+한 학기 동안 12개 반의 제출이 쌓이면 main.keywords의 대부분은 실시간으로 아무도 보지 않는
+지난 주차입니다. 끝난 주차의 원본 행을 ATTACH된 보관 DB(archive.keywords)로 옮기고,
+주차×반×카테고리×키워드 집계(archive.stats_keyword_week_class)를 그 주차만 다시 계산합니다.
+main에서 지울 때는 기존 트리거가 현재 데이터 집계를 알아서 줄입니다.
+
+- 현재 보드의 행은 옮기지 않습니다. (실시간 보드는 main만 읽음)
+- 주차마다 별도 트랜잭션이라 쓰기 잠금을 오래 잡지 않습니다.
+- 보관 DB로 복사(INSERT OR IGNORE) 후 main에서 삭제하고 집계는 보관 행에서 다시 세므로,
+  중간에 멈췄다가 다시 실행해도 같은 결과가 됩니다.
+"""
+from liveboard.db import ACTIVE_BOARD_SQL, ITEM_COLUMNS, current_week, get_maintenance, get_pool
+
+# 옮길 대상: 해당 주차이면서 현재 보드가 아닌 행
+_MOVABLE = f"week = ? AND board_id <> {ACTIVE_BOARD_SQL}"
+
+
+def archivable_weeks(before_week: int) -> list[int]:
+    """before_week 이전 주차 중 main에 옮길 행이 남아 있는 주차 목록."""
+    with get_pool().reader() as conn:
+        rows = conn.execute(
+            f"SELECT DISTINCT week FROM main.keywords WHERE week BETWEEN 1 AND ? AND board_id <> {ACTIVE_BOARD_SQL} ORDER BY week",
+            (before_week - 1,),
+        ).fetchall()
+    return [r[0] for r in rows]
+
+
+def _archive_week(conn, week: int) -> int:
+    cols = ", ".join(ITEM_COLUMNS)
+    conn.execute(
+        f"INSERT OR IGNORE INTO archive.keywords ({cols}) SELECT {cols} FROM main.keywords WHERE {_MOVABLE}",
+        (week,),
+    )
+    moved = conn.execute(f"DELETE FROM main.keywords WHERE {_MOVABLE}", (week,)).rowcount
+    # 보관 집계는 보관된 원본 행에서 그 주차만 다시 계산
+    conn.execute("DELETE FROM archive.stats_keyword_week_class WHERE week = ?", (week,))
+    conn.execute("""
+        INSERT INTO archive.stats_keyword_week_class (keyword, category, week, class_num, board_id, cnt)
+        SELECT keyword, category, week, class_num, board_id, COUNT(*) FROM archive.keywords
+        WHERE week = ?
+        GROUP BY week, class_num, category, keyword, board_id
+    """, (week,))
+    return moved
+
+
+def archive_weeks(before_week: int | None = None) -> dict[int, int]:
+    """
+    before_week 이전의 끝난 주차를 보관 DB로 옮깁니다. (기본: 학사 일정상 이번 주 이전)
+    반환: {주차: 옮긴 행 수}
+    """
+    if before_week is None:
+        before_week = current_week()
+    if not before_week:
+        return {}
+    pool = get_pool()
+    result = {}
+    for week in archivable_weeks(before_week):
+        with pool.writer() as conn:
+            result[week] = _archive_week(conn, week)
+    if result:
+        # 옮긴 만큼 main에 빈 페이지가 생기므로 다음 유지보수 주기에 파일 크기를 줄임
+        get_maintenance().request_vacuum()
+    return result
+
+
+def archive_summary() -> dict:
+    """현재/보관 행 수와 보관된 주차 목록."""
+    with get_pool().reader() as conn:
+        live = conn.execute("SELECT IFNULL(SUM(cnt), 0) FROM main.stats_category").fetchone()[0]
+        archived, weeks = conn.execute(
+            "SELECT IFNULL(SUM(cnt), 0), group_concat(DISTINCT week) FROM archive.stats_keyword_week_class"
+        ).fetchone()
+    return {
+        "live_rows": live,
+        "archived_rows": archived,
+        "archived_weeks": sorted(int(w) for w in weeks.split(",")) if weeks else [],
+    }
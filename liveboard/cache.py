@@ -0,0 +1,114 @@
+"""
+세션 간에 공유하는 조회 결과 캐시.
+
+키는 (함수 이름, 인자, 데이터 세대 번호)입니다. 새 제출이 커밋되어 세대 번호가 바뀌면
+이전 세대의 항목은 더 이상 맞지 않으므로 한꺼번에 비웁니다.
+같은 세대 안에서는 30명이 같은 페이지를 열어도 쿼리는 한 번만 실행됩니다.
+"""
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from liveboard.notify import current_generation
+
+MAX_ENTRIES = 256
+MAX_ROWS = 50_000     # 캐시에 담는 결과 행 수의 합 상한 (메모리 제한)
+
+
+class ResultCache:
+    """행 수 기준 크기 제한이 있는 스레드 안전 LRU 캐시."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_rows: int = MAX_ROWS):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._data: OrderedDict = OrderedDict()   # key -> (value, rows)
+        self._rows = 0
+        self._generation = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _weight(value) -> int:
+        try:
+            return max(1, len(value))
+        except TypeError:
+            return 1
+
+    def _check_generation(self, generation: int):
+        # 세대가 바뀌면 이전 결과는 모두 무효
+        if generation != self._generation:
+            self._data.clear()
+            self._rows = 0
+            self._generation = generation
+
+    def get_or_compute(self, key, generation: int, compute):
+        with self._lock:
+            self._check_generation(generation)
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key][0]
+            self.misses += 1
+
+        value = compute()
+        weight = self._weight(value)
+        if weight > self.max_rows:
+            return value
+
+        with self._lock:
+            # 계산하는 동안 세대가 바뀌었으면 저장하지 않음
+            if generation != self._generation:
+                return value
+            if key not in self._data:
+                self._data[key] = (value, weight)
+                self._rows += weight
+            while len(self._data) > self.max_entries or self._rows > self.max_rows:
+                _key, (_value, old_weight) = self._data.popitem(last=False)
+                self._rows -= old_weight
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._rows = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "entries": len(self._data),
+                "rows": self._rows,
+                "evictions": self.evictions,
+                "generation": self._generation,
+            }
+
+
+result_cache = ResultCache()
+
+
+def _freeze(value):
+    # 리스트/집합 인자도 캐시 키로 쓸 수 있도록 튜플로 변환
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    return value
+
+
+def cached_query(fn):
+    """조회 함수를 공유 캐시로 감쌉니다. (반환값은 여러 세션이 공유하므로 수정하지 말 것)"""
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (name, _freeze(args), tuple(sorted((k, _freeze(v)) for k, v in kwargs.items())))
+        return result_cache.get_or_compute(key, current_generation(), lambda: fn(*args, **kwargs))
+
+    wrapper.uncached = fn
+    return wrapper
@@ -0,0 +1,652 @@
+"""
+모든 페이지가 함께 쓰는 SQLite 접근 모듈.
+
+Streamlit은 페이지 스크립트를 rerun마다 다시 실행하지만, import된 모듈은
+프로세스 안에서 한 번만 로드됩니다. 그래서 연결 풀을 여기서 한 번만 만들고
+(쓰기 연결 1개 + 읽기 연결 N개) 모든 페이지가 같은 풀을 공유합니다.
+
+끝난 주차의 행은 보관 DB 파일(keywords_archive.db)로 옮겨 둡니다. (liveboard.archive)
+모든 연결에 "archive"라는 이름으로 ATTACH되어 있어 한 쿼리에서 함께 읽을 수 있고,
+실시간 보드 조회는 main(현재 데이터)만 읽습니다.
+"""
+import atexit
+import queue
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+from liveboard.academic_calendar import TERM_WEEKS, WeekIndex, build_weeks
+from liveboard.maintenance import Maintenance
+from liveboard.migrations import ensure_archive_schema, migrate
+from liveboard.write_queue import WriteQueue
+
+# DB 경로 (프로젝트 루트의 keywords.db)
+DB_PATH = Path(__file__).resolve().parents[1] / "keywords.db"
+
+# 연결마다 한 번만 적용하는 PRAGMA 설정
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 8192          # 연결당 페이지 캐시 8MB
+MMAP_SIZE = 64 * 1024 * 1024  # 64MB 메모리 맵 읽기
+READER_COUNT = 4
+JOURNAL_SIZE_LIMIT = 1024 * 1024   # 체크포인트 후 다음 쓰기에서 WAL 파일을 이 크기까지 줄임
+
+# 쓰기 잠금 경합 (여러 서버 프로세스가 같은 DB 파일에 쓸 때)
+# 쓰기 연결은 SQLite 안에서 짧게만 기다리고, 잠금을 못 얻으면 지터를 둔 지수 백오프로 다시 시도합니다.
+# 최악의 경우 대기 시간이 제한되므로(약 4초) 제출이 한참 멈춰 있지 않고 실패를 바로 알립니다.
+WRITER_BUSY_TIMEOUT_MS = 100
+WRITE_RETRIES = 8
+RETRY_BASE_SECONDS = 0.025
+RETRY_MAX_SECONDS = 1.0
+
+
+def archive_path_for(path: Path | str) -> str:
+    """DB 파일 옆의 보관 DB 경로 (keywords.db -> keywords_archive.db)."""
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}_archive{path.suffix}"))
+
+
+def _is_busy(e: sqlite3.Error) -> bool:
+    code = getattr(e, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return "locked" in str(e) or "busy" in str(e)
+
+
+class WriteStats:
+    """프로세스별 쓰기 잠금 대기/재시도/실패 카운터."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.transactions = 0
+        self.retries = 0
+        self.failures = 0
+        self.lock_wait = 0.0        # 쓰기 잠금을 얻기까지 기다린 시간의 합 (초, 프로세스 안 + SQLite 파일 잠금)
+        self.max_lock_wait = 0.0
+
+    def record(self, waited: float, retries: int, failed: bool):
+        with self._lock:
+            self.lock_wait += waited
+            self.max_lock_wait = max(self.max_lock_wait, waited)
+            self.retries += retries
+            if failed:
+                self.failures += 1
+            else:
+                self.transactions += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.transactions + self.failures
+            return {
+                "transactions": self.transactions,
+                "retries": self.retries,
+                "failures": self.failures,
+                "lock_wait_seconds": round(self.lock_wait, 3),
+                "avg_lock_wait_ms": round(self.lock_wait / attempts * 1000, 1) if attempts else 0.0,
+                "max_lock_wait_ms": round(self.max_lock_wait * 1000, 1),
+            }
+
+
+class ConnectionPool:
+    """
+    쓰기 연결 1개와 읽기 연결 N개를 관리하는 스레드 안전 풀.
+    WAL 모드에서는 읽기가 쓰기를 막지 않으므로 읽기 연결은 여러 개,
+    쓰기는 어차피 한 번에 하나만 가능하므로 잠금으로 직렬화합니다.
+    """
+
+    def __init__(self, path: Path | str = DB_PATH, readers: int = READER_COUNT, archive_path: Path | str | None = None):
+        self.path = str(path)
+        self.archive_path = str(archive_path or archive_path_for(path))
+        self._write_lock = threading.RLock()
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL;")
+        self._writer.execute("PRAGMA archive.journal_mode=WAL;")
+        self._writer.execute(f"PRAGMA journal_size_limit={JOURNAL_SIZE_LIMIT};")
+        self._writer.execute(f"PRAGMA archive.journal_size_limit={JOURNAL_SIZE_LIMIT};")
+        # 마지막 쓰기 시각 (유지보수 작업이 idle 여부를 판단할 때 사용)
+        self.last_write = time.monotonic()
+        # 스키마는 프로세스당 한 번, 풀을 만들 때만 최신 버전으로 올림
+        migrate(self._writer)
+        ensure_archive_schema(self._writer)
+        # 마이그레이션 이후의 쓰기는 _begin_immediate()가 재시도를 맡으므로 SQLite 안에서는 짧게만 대기
+        self._writer.execute(f"PRAGMA busy_timeout={WRITER_BUSY_TIMEOUT_MS};")
+        self.write_stats = WriteStats()
+
+        self._max_readers = max(1, readers)
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        self._all_readers: list[sqlite3.Connection] = []
+        self._reader_lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS};")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB};")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE};")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        conn.execute("ATTACH DATABASE ? AS archive", (self.archive_path,))
+        conn.execute("PRAGMA archive.synchronous=NORMAL;")
+        if read_only:
+            conn.execute("PRAGMA query_only=ON;")
+        return conn
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if len(self._all_readers) < self._max_readers:
+                conn = self._connect(read_only=True)
+                self._all_readers.append(conn)
+                return conn
+        # 모든 읽기 연결이 사용 중이면 반납될 때까지 대기
+        return self._readers.get()
+
+    @contextmanager
+    def reader(self):
+        """읽기 전용 연결을 빌려줍니다. with 블록이 끝나면 풀에 반납됩니다."""
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _begin_immediate(self, started: float):
+        """BEGIN IMMEDIATE로 파일 쓰기 잠금을 먼저 잡습니다. 바쁘면 지터 백오프로 WRITE_RETRIES번까지 재시도."""
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                self._writer.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or attempt == WRITE_RETRIES:
+                    self.write_stats.record(time.monotonic() - started, attempt, failed=True)
+                    raise
+                delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt)
+                time.sleep(random.uniform(delay / 2, delay))
+            else:
+                self.write_stats.record(time.monotonic() - started, attempt, failed=False)
+                return
+
+    @contextmanager
+    def writer(self):
+        """
+        쓰기 연결을 잠금과 함께 빌려줍니다. 블록이 끝나면 커밋(예외 시 롤백)합니다.
+        트랜잭션은 BEGIN IMMEDIATE로 시작하므로, 잠금 경합은 블록에 들어가기 전에만 일어납니다.
+        """
+        started = time.monotonic()
+        with self._write_lock:
+            conn = self._writer
+            if conn.in_transaction:
+                # 같은 스레드에서 중첩 호출: 바깥 트랜잭션에 포함
+                yield conn
+                return
+            self._begin_immediate(started)
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            self.last_write = time.monotonic()
+
+    @contextmanager
+    def exclusive(self):
+        """
+        쓰기 연결을 트랜잭션 없이 잠금만 잡고 빌려줍니다.
+        체크포인트/VACUUM처럼 트랜잭션 밖에서 실행해야 하는 명령용입니다.
+        """
+        with self._write_lock:
+            yield self._writer
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        with self._reader_lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+        with self._write_lock:
+            self._writer.close()
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+_maintenance_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """프로세스 전체에서 공유하는 연결 풀 (처음 호출될 때 한 번만 생성)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+                atexit.register(_pool.close)
+                get_maintenance(_pool)
+    return _pool
+
+
+_maintenance: Maintenance | None = None
+
+
+def get_maintenance(pool: ConnectionPool | None = None) -> Maintenance:
+    """
+    프로세스 전체에서 공유하는 WAL 체크포인트/유지보수 스레드 (풀을 만들 때 함께 시작).
+    풀보다 나중에 atexit에 등록되므로 풀이 닫히기 전에 먼저 멈춥니다.
+    """
+    global _maintenance
+    if _maintenance is None:
+        pool = pool or get_pool()
+        with _maintenance_lock:
+            if _maintenance is None:
+                _maintenance = Maintenance(pool)
+                atexit.register(_maintenance.close)
+    return _maintenance
+
+
+_write_queue: WriteQueue | None = None
+
+
+def write_stats() -> dict:
+    """이 프로세스의 쓰기 잠금 대기 시간/재시도/실패 횟수."""
+    return get_pool().write_stats.snapshot()
+
+
+def get_write_queue() -> WriteQueue:
+    """
+    프로세스 전체에서 공유하는 그룹 커밋 쓰기 큐.
+    atexit은 등록의 역순으로 실행되므로, 풀이 닫히기 전에 남은 행이 먼저 커밋됩니다.
+    """
+    global _write_queue
+    if _write_queue is None:
+        pool = get_pool()
+        with _pool_lock:
+            if _write_queue is None:
+                _write_queue = WriteQueue(pool)
+                atexit.register(_write_queue.close)
+    return _write_queue
+
+
+# ------------------------------------
+# 데이터 조회/저장 함수 (모든 페이지 공용)
+# ------------------------------------
+
+# 현재 보드 = 가장 최근에 연 보드. 제출은 저장 시점의 현재 보드에 들어갑니다.
+ACTIVE_BOARD_SQL = "(SELECT MAX(id) FROM boards)"
+
+
+def _board_filter(board_id: int | None):
+    """board_id 조건절과 파라미터 — board_id가 None이면 현재 보드."""
+    if board_id is None:
+        return f"board_id = {ACTIVE_BOARD_SQL}", []
+    return "board_id = ?", [board_id]
+
+
+# week를 주지 않으면 제출 날짜(ts의 앞 10자리 = 현지 날짜)로 학사 일정에서 주차를 찾아 저장
+INSERT_KEYWORD_SQL = (
+    "INSERT INTO keywords (keyword, category, grade, class_num, student_no, student_name, note, ts, ts_epoch, week, board_id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, "
+    "COALESCE(?, (SELECT week FROM academic_weeks WHERE substr(?, 1, 10) BETWEEN start_date AND end_date)), "
+    f"{ACTIVE_BOARD_SQL})"
+)
+# 제출 후 커밋 확인까지 기다리는 최대 시간 (초)
+SUBMIT_TIMEOUT = 10
+
+
+def submit_keyword(kw: str, category: str, grade: str, class_num: int, student_no: int, student_name: str, note: str, week: int | None, ts: str | None = None):
+    """제출을 쓰기 큐에 넣고 바로 Future를 반환합니다. (결과: 새 행의 id)"""
+    # 한국 시간으로 저장 권장 (ts는 현지 시각 문자열, ts_epoch는 정렬/구간 조회용 정수 초)
+    dt = datetime.fromisoformat(ts) if ts else datetime.now().astimezone()
+    ts = ts or dt.isoformat()
+    return get_write_queue().submit(
+        INSERT_KEYWORD_SQL,
+        (kw, category, grade, class_num, student_no, student_name, note, ts, int(dt.timestamp()), week, ts),
+    )
+
+
+def add_keyword(kw: str, category: str, grade: str, class_num: int, student_no: int, student_name: str, note: str, week: int | None, ts: str | None = None) -> int:
+    """제출을 저장하고, 다른 제출들과 함께 실제로 커밋될 때까지 기다린 뒤 새 행의 id를 반환합니다."""
+    fut = submit_keyword(kw, category, grade, class_num, student_no, student_name, note, week, ts)
+    return fut.result(timeout=SUBMIT_TIMEOUT)
+
+
+# ------------------------------------
+# 실시간 보드용 조회 (board_id가 None이면 현재 보드)
+# ------------------------------------
+
+def get_keywords(limit: int = 500, category: str | None = None, board_id: int | None = None):
+    board_sql, params = _board_filter(board_id)
+    with get_pool().reader() as conn:
+        if category and category != "All":
+            rows = conn.execute(f"SELECT id, keyword, category, grade, class_num, student_no, student_name, note, ts FROM keywords WHERE {board_sql} AND category = ? ORDER BY id DESC LIMIT ?", (*params, category, limit)).fetchall()
+        else:
+            rows = conn.execute(f"SELECT id, keyword, category, grade, class_num, student_no, student_name, note, ts FROM keywords WHERE {board_sql} ORDER BY id DESC LIMIT ?", (*params, limit)).fetchall()
+    return list(reversed(rows))
+
+
+def get_keyword_delta(last_id: int | None, category: str | None = None, limit: int = 500, board_id: int | None = None):
+    """
+    last_id 이후에 추가된 행과 현재 전체 행 수를 같은 스냅샷에서 함께 반환합니다.
+    last_id가 None이면 가장 최근 limit건을 반환합니다.
+    반환: (rows, total) — rows는 (id, keyword, category, note) id 오름차순
+    실시간 보드가 표에 쓰는 컬럼만 읽습니다. (이름/학번 등은 읽지 않음)
+    """
+    board_sql, board_params = _board_filter(board_id)
+    where, params = [board_sql, "id > ?"], [*board_params, last_id or 0]
+    count_where, count_params = [board_sql], list(board_params)
+    if category and category != "All":
+        where.append("category = ?")
+        params.append(category)
+        count_where.append("category = ?")
+        count_params.append(category)
+    order = "DESC" if last_id is None else "ASC"
+    with get_pool().reader() as conn:
+        conn.execute("BEGIN")
+        try:
+            rows = conn.execute(
+                f"SELECT id, keyword, category, note FROM keywords WHERE {' AND '.join(where)} ORDER BY id {order} LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+            total = conn.execute(
+                f"SELECT IFNULL(SUM(cnt), 0) FROM stats_category WHERE {' AND '.join(count_where)}", count_params
+            ).fetchone()[0]
+        finally:
+            conn.rollback()
+    if last_id is None:
+        rows.reverse()
+    return rows, total
+
+
+def get_explanations_by_keyword(keyword: str, category: str | None = None, limit: int = 200, board_id: int | None = None):
+    board_sql, params = _board_filter(board_id)
+    with get_pool().reader() as conn:
+        if category and category != "All":
+            return conn.execute(f"""SELECT student_name, class_num, student_no, note, ts
+                                    FROM keywords WHERE {board_sql} AND keyword = ? AND category = ? ORDER BY id DESC LIMIT ?""",
+                                (*params, keyword, category, limit)).fetchall()
+        return conn.execute(f"""SELECT student_name, class_num, student_no, note, ts
+                                FROM keywords WHERE {board_sql} AND keyword = ? ORDER BY id DESC LIMIT ?""",
+                            (*params, keyword, limit)).fetchall()
+
+
+def get_category_counts(board_id: int | None = None):
+    """카테고리별 제출 수 (트리거로 유지되는 집계 테이블에서 조회)."""
+    board_sql, params = _board_filter(board_id)
+    with get_pool().reader() as conn:
+        return conn.execute(f"SELECT category, cnt FROM stats_category WHERE {board_sql} ORDER BY category", params).fetchall()
+
+
+def get_keyword_counts(category: str | None = None, board_id: int | None = None):
+    """키워드별 제출 수 [(keyword, count), ...] — 제출 수와 상관없이 정확한 전체 집계."""
+    board_sql, params = _board_filter(board_id)
+    with get_pool().reader() as conn:
+        if category and category != "All":
+            return conn.execute(
+                f"SELECT keyword, cnt FROM stats_keyword WHERE {board_sql} AND category = ? ORDER BY cnt DESC, keyword",
+                (*params, category),
+            ).fetchall()
+        return conn.execute(
+            f"SELECT keyword, SUM(cnt) AS total FROM stats_keyword WHERE {board_sql} GROUP BY keyword ORDER BY total DESC, keyword",
+            params,
+        ).fetchall()
+
+
+def get_unique_keywords(board_id: int | None = None):
+    board_sql, params = _board_filter(board_id)
+    with get_pool().reader() as conn:
+        rows = conn.execute(f"SELECT DISTINCT keyword FROM stats_keyword WHERE {board_sql}", params).fetchall()
+    return [row[0] for row in rows]
+
+
+def get_keyword_notes(board_id: int | None = None):
+    """(keyword, category, note, 제출 수) — 같은 부연 설명은 한 번만, 빈 설명 포함. (템플릿 퀴즈 재료)"""
+    board_sql, params = _board_filter(board_id)
+    with get_pool().reader() as conn:
+        return conn.execute(f"""SELECT keyword, category, COALESCE(note, ''), COUNT(*) FROM keywords WHERE {board_sql}
+                                GROUP BY keyword, category, COALESCE(note, '') ORDER BY keyword, category""", params).fetchall()
+
+
+# ------------------------------------
+# Teacher's Page용 조회 (board_ids를 주지 않으면 모든 보드)
+# 현재 데이터(main)와 보관 데이터(archive)를 같은 조건으로 UNION ALL 해서 함께 읽습니다.
+# ------------------------------------
+
+ITEM_COLUMNS = ["id", "keyword", "category", "grade", "class_num", "student_no", "student_name", "note", "ts", "week", "ts_epoch", "board_id"]
+LIVE_AND_ARCHIVE = ("main", "archive")
+
+
+def _in_clause(column: str, values) -> tuple[str, list]:
+    values = list(values)
+    return f"{column} IN ({', '.join('?' * len(values))})", values
+
+
+def _teacher_filter(class_nums=None, category: str | None = None, week_range: tuple[int, int] | None = None, board_ids=None):
+    """Teacher's Page 필터(보드/반/카테고리/주차 범위)의 WHERE 절과 파라미터."""
+    where, params = [], []
+    if week_range is not None:
+        where.append("week BETWEEN ? AND ?")
+        params.extend(week_range)
+    if class_nums:
+        clause, values = _in_clause("class_num", class_nums)
+        where.append(clause)
+        params.extend(values)
+    if category and category != "All":
+        where.append("category = ?")
+        params.append(category)
+    if board_ids:
+        clause, values = _in_clause("board_id", board_ids)
+        where.append(clause)
+        params.extend(values)
+    return (" WHERE " + " AND ".join(where) if where else ""), params
+
+
+def get_filtered_items(class_nums=None, category: str | None = None, week_range: tuple[int, int] | None = None, board_ids=None):
+    """
+    Teacher's Page 필터를 WHERE 절로 옮겨 현재+보관 데이터에서 조회합니다.
+    행 수 제한 없이 조건에 맞는 행만 읽으며, 컬럼 순서는 ITEM_COLUMNS와 같습니다. (id 오름차순)
+    """
+    where_sql, params = _teacher_filter(class_nums, category, week_range, board_ids)
+    cols = ", ".join(ITEM_COLUMNS)
+    sql = " UNION ALL ".join(f"SELECT {cols} FROM {schema}.keywords{where_sql}" for schema in LIVE_AND_ARCHIVE)
+    with get_pool().reader() as conn:
+        return conn.execute(sql + " ORDER BY id", params * len(LIVE_AND_ARCHIVE)).fetchall()
+
+
+def get_top_keywords_by_week(class_nums=None, category: str | None = None, week_range: tuple[int, int] = (1, 17), top_k: int = 1, board_ids=None):
+    """
+    주차×카테고리별 상위 키워드를 한 번의 집계 쿼리로 구합니다. (동점 포함 상위 top_k 순위)
+    원본 행 대신 현재/보관 DB의 stats_keyword_week_class 집계 테이블을 읽습니다.
+    반환: [(week, category, keyword, count, rank), ...] 주차/카테고리/순위 순
+    """
+    where_sql, params = _teacher_filter(class_nums, category, week_range, board_ids)
+    rollups = " UNION ALL ".join(
+        f"SELECT week, category, keyword, cnt FROM {schema}.stats_keyword_week_class{where_sql}" for schema in LIVE_AND_ARCHIVE
+    )
+    sql = f"""
+        WITH agg AS (
+            SELECT week, category, keyword, SUM(cnt) AS cnt
+            FROM ({rollups})
+            GROUP BY week, category, keyword
+        ), ranked AS (
+            SELECT week, category, keyword, cnt,
+                   RANK() OVER (PARTITION BY week, category ORDER BY cnt DESC) AS rnk
+            FROM agg
+        )
+        SELECT week, category, keyword, cnt, rnk FROM ranked
+        WHERE rnk <= ?
+        ORDER BY week, category, rnk, keyword
+    """
+    with get_pool().reader() as conn:
+        return conn.execute(sql, (*(params * len(LIVE_AND_ARCHIVE)), top_k)).fetchall()
+
+
+def get_week_range():
+    """저장된 주차의 (최소, 최대) — 현재+보관 데이터 기준. 주차 데이터가 없으면 (None, None)."""
+    with get_pool().reader() as conn:
+        return conn.execute("""
+            SELECT MIN(lo), MAX(hi) FROM (
+                SELECT MIN(week) AS lo, MAX(week) AS hi FROM main.keywords
+                UNION ALL
+                SELECT MIN(week), MAX(week) FROM archive.keywords
+            )
+        """).fetchone()
+
+
+def get_total_count() -> int:
+    """모든 보드의 전체 제출 수 (현재 + 보관)."""
+    with get_pool().reader() as conn:
+        return conn.execute("""
+            SELECT (SELECT IFNULL(SUM(cnt), 0) FROM main.stats_category)
+                 + (SELECT IFNULL(SUM(cnt), 0) FROM archive.stats_keyword_week_class)
+        """).fetchone()[0]
+
+
+# ------------------------------------
+# 시간 구간 조회 (ts_epoch 인덱스, board_id가 None이면 현재 보드)
+# ------------------------------------
+
+def get_submissions_between(t0: int, t1: int, category: str | None = None, board_id: int | None = None):
+    """t0 <= ts_epoch < t1 구간의 제출 [(id, keyword, category, ts_epoch), ...] (시간순)."""
+    board_sql, params = _board_filter(board_id)
+    with get_pool().reader() as conn:
+        if category and category != "All":
+            return conn.execute(
+                f"SELECT id, keyword, category, ts_epoch FROM keywords WHERE ts_epoch >= ? AND ts_epoch < ? AND {board_sql} AND category = ? ORDER BY ts_epoch, id",
+                (t0, t1, *params, category),
+            ).fetchall()
+        return conn.execute(
+            f"SELECT id, keyword, category, ts_epoch FROM keywords WHERE ts_epoch >= ? AND ts_epoch < ? AND {board_sql} ORDER BY ts_epoch, id",
+            (t0, t1, *params),
+        ).fetchall()
+
+
+BUCKET_SQL = """
+    SELECT (ts_epoch / ?) * ? AS bucket, category, COUNT(*)
+    FROM keywords
+    WHERE ts_epoch >= ? AND ts_epoch < ? AND {board_sql}
+    GROUP BY bucket, category
+    ORDER BY bucket, category
+"""
+
+
+def get_submission_buckets(t0: int, t1: int, bucket_minutes: int = 1, board_id: int | None = None):
+    """
+    t0 <= ts_epoch < t1 구간의 N분 단위 카테고리별 제출 수.
+    반환: [(버킷 시작 epoch, category, count), ...] — 제출이 없는 버킷은 빠짐
+    """
+    size = max(1, int(bucket_minutes)) * 60
+    board_sql, params = _board_filter(board_id)
+    with get_pool().reader() as conn:
+        return conn.execute(BUCKET_SQL.format(board_sql=board_sql), (size, size, t0, t1, *params)).fetchall()
+
+
+def get_bucket_snapshot(t0: int, t1: int, bucket_minutes: int = 1, board_id: int | None = None):
+    """
+    분 단위 버킷 집계와 그 시점의 (최대 id, 보드 행 수)를 같은 스냅샷에서 반환합니다.
+    이후에는 최대 id 다음 행만 더하면 되므로 증분 집계의 시작점으로 씁니다.
+    """
+    size = max(1, int(bucket_minutes)) * 60
+    board_sql, params = _board_filter(board_id)
+    with get_pool().reader() as conn:
+        conn.execute("BEGIN")
+        try:
+            buckets = conn.execute(BUCKET_SQL.format(board_sql=board_sql), (size, size, t0, t1, *params)).fetchall()
+            max_id = conn.execute("SELECT IFNULL(MAX(id), 0) FROM keywords").fetchone()[0]
+            total = conn.execute(f"SELECT IFNULL(SUM(cnt), 0) FROM stats_category WHERE {board_sql}", params).fetchone()[0]
+        finally:
+            conn.rollback()
+    return buckets, max_id, total
+
+
+def get_submissions_since(last_id: int, board_id: int | None = None):
+    """
+    last_id 이후 행의 (id, category, ts_epoch)와 현재 보드 행 수를 같은 스냅샷에서 반환합니다.
+    반환: (rows, total)
+    """
+    board_sql, params = _board_filter(board_id)
+    with get_pool().reader() as conn:
+        conn.execute("BEGIN")
+        try:
+            rows = conn.execute(
+                f"SELECT id, category, ts_epoch FROM keywords WHERE {board_sql} AND id > ? ORDER BY id", (*params, last_id)
+            ).fetchall()
+            total = conn.execute(f"SELECT IFNULL(SUM(cnt), 0) FROM stats_category WHERE {board_sql}", params).fetchone()[0]
+        finally:
+            conn.rollback()
+    return rows, total
+
+
+# ------------------------------------
+# 보드 (수업 단위)
+# ------------------------------------
+
+def get_active_board():
+    """현재 보드 (id, name, created_at)."""
+    with get_pool().reader() as conn:
+        return conn.execute(f"SELECT id, name, created_at FROM boards WHERE id = {ACTIVE_BOARD_SQL}").fetchone()
+
+
+def list_boards():
+    """모든 보드 [(id, name, created_at, 제출 수), ...] 최신순. (제출 수는 현재 + 보관)"""
+    with get_pool().reader() as conn:
+        return conn.execute("""
+            SELECT b.id, b.name, b.created_at,
+                   (SELECT IFNULL(SUM(cnt), 0) FROM main.stats_category s WHERE s.board_id = b.id)
+                 + (SELECT IFNULL(SUM(cnt), 0) FROM archive.stats_keyword_week_class a WHERE a.board_id = b.id)
+            FROM boards b
+            ORDER BY b.id DESC
+        """).fetchall()
+
+
+def open_board(name: str = "") -> int:
+    """새 보드를 열어 현재 보드로 만듭니다. (기존 제출은 지우지 않음, O(1))"""
+    now = datetime.now().astimezone()
+    with get_pool().writer() as conn:
+        return conn.execute(
+            "INSERT INTO boards (name, created_at, created_epoch) VALUES (?, ?, ?)",
+            (name, now.isoformat(), int(now.timestamp())),
+        ).lastrowid
+
+
+# ------------------------------------
+# 학사 일정 (주차 계산 기준)
+# ------------------------------------
+
+BACKFILL_WEEK_SQL = """
+    UPDATE keywords
+    SET week = (SELECT w.week FROM academic_weeks w WHERE substr(keywords.ts, 1, 10) BETWEEN w.start_date AND w.end_date)
+    WHERE week IS NULL
+"""
+
+
+def get_calendar():
+    """저장된 학사 일정: (주차 경계 [(week, start, end)], 휴일 [day])."""
+    with get_pool().reader() as conn:
+        weeks = conn.execute("SELECT week, start_date, end_date FROM academic_weeks ORDER BY week").fetchall()
+        holidays = [r[0] for r in conn.execute("SELECT day FROM academic_holidays ORDER BY day").fetchall()]
+    return weeks, holidays
+
+
+def save_calendar(term_start: date, holidays=(), weeks: int = TERM_WEEKS) -> int:
+    """
+    학사 일정을 저장하고, 주차가 비어 있는 기존 행을 한 번의 UPDATE로 채웁니다.
+    (학생이 직접 고른 주차는 덮어쓰지 않음) 채워진 행 수를 반환합니다.
+    """
+    rows = build_weeks(term_start, holidays, weeks)
+    with get_pool().writer() as conn:
+        conn.execute("DELETE FROM academic_weeks")
+        conn.execute("DELETE FROM academic_holidays")
+        conn.executemany("INSERT INTO academic_weeks (week, start_date, end_date) VALUES (?, ?, ?)", rows)
+        conn.executemany("INSERT OR IGNORE INTO academic_holidays (day) VALUES (?)", [(d.isoformat(),) for d in holidays])
+        return conn.execute(BACKFILL_WEEK_SQL + " AND substr(ts, 1, 10) BETWEEN ? AND ?", (rows[0][1], rows[-1][2])).rowcount if rows else 0
+
+
+def current_week(today: date | None = None) -> int | None:
+    """오늘이 학사 일정상 몇 주차인지 (일정이 없거나 학기 밖이면 None)."""
+    weeks, _holidays = get_calendar()
+    return WeekIndex(weeks).week_for(today or date.today())
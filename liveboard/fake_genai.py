@@ -0,0 +1,74 @@
+"""
+네트워크 없이 퀴즈 생성 흐름을 돌려 보기 위한 가짜 Gemini 클라이언트.
+
+google-genai의 client.models.generate_content(model=, contents=, config=)와 같은 모양으로 호출되고,
+.text에 JSON 문자열이 든 응답을 돌려줍니다. 프롬프트의 "키워드 목록:" 줄에서 키워드를 읽어
+키워드마다 "키워드마다 N개씩" 만큼 문제를 만듭니다.
+
+- latency: 호출 한 번에 걸리는 시간 (초, 배치 병렬 처리/스트리밍 표시 확인용)
+- timeout: latency가 이보다 길면 실제 클라이언트처럼 TimeoutError
+- fail_rate: 이 확률로 일시 오류(RuntimeError)를 내서 재시도 경로를 확인
+
+LIVEBOARD_AI_CLIENT=fake 환경 변수를 주면 랜덤 퀴즈 페이지가 API 키 없이 이 클라이언트를 씁니다.
+"""
+import json
+import random
+import re
+import threading
+import time
+
+_KEYWORDS_LINE = re.compile(r"키워드 목록:\s*(.*)")
+_PER_KEYWORD = re.compile(r"키워드마다\s*(\d+)개씩")
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeModels:
+    def __init__(self, client: "FakeGenAIClient"):
+        self._client = client
+
+    def generate_content(self, model=None, contents="", config=None):
+        return self._client._generate(str(contents))
+
+
+class FakeGenAIClient:
+    def __init__(self, latency: float = 0.5, timeout: float | None = None, fail_rate: float = 0.0, seed: int | None = None):
+        self.latency = latency
+        self.timeout = timeout
+        self.fail_rate = fail_rate
+        self.models = _FakeModels(self)
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _generate(self, prompt: str) -> FakeResponse:
+        with self._lock:
+            self.calls += 1
+            fail = self._rng.random() < self.fail_rate
+        if self.timeout is not None and self.latency > self.timeout:
+            time.sleep(self.timeout)
+            raise TimeoutError(f"가짜 클라이언트 응답 시간 초과 ({self.timeout}초)")
+        time.sleep(self.latency)
+        if fail:
+            raise RuntimeError("가짜 클라이언트 일시 오류")
+
+        match = _KEYWORDS_LINE.search(prompt)
+        keywords = [k.strip() for k in match.group(1).split(",") if k.strip()] if match else []
+        per = _PER_KEYWORD.search(prompt)
+        per_keyword = int(per.group(1)) if per else 1
+
+        questions = []
+        for keyword in keywords:
+            for i in range(per_keyword):
+                questions.append({
+                    "q_num": len(questions) + 1,
+                    "keyword": keyword,
+                    "question": f"'{keyword}'에 대한 연습 문제 {i + 1}: 알맞은 설명을 고르세요.",
+                    "options": [f"1. {keyword}의 뜻", "2. 관계없는 설명 A", "3. 관계없는 설명 B", "4. 관계없는 설명 C"],
+                    "answer": 1,
+                })
+        return FakeResponse(json.dumps({"quiz_title": "오늘의 영어 질문 키워드 퀴즈", "questions": questions},
+                                       ensure_ascii=False))
@@ -0,0 +1,60 @@
+"""
+실시간 보드용 증분(delta) 조회.
+
+보드를 프로젝터에 띄워 두면 rerun이 계속 일어나는데, 매번 최근 500건 전체를 다시 읽고
+표/빈도를 새로 만들 필요는 없습니다. LiveFeed는 이미 처리한 가장 큰 id를 기억해 두고
+그 이후의 행만 가져와 최근 목록에 덧붙입니다. 삭제/초기화가 감지되면(행 수가 맞지 않으면)
+그때만 처음부터 다시 읽습니다.
+보드마다 따로 만들어 쓰며(board_id), 새 보드가 열리면 페이지가 새 LiveFeed를 만듭니다.
+"""
+from collections import deque
+
+from liveboard.db import get_keyword_delta
+from liveboard.queries import get_keyword_counts
+
+RECENT_LIMIT = 500
+
+
+class LiveFeed:
+    def __init__(self, category: str | None = None, limit: int = RECENT_LIMIT, board_id: int | None = None):
+        self.category = category
+        self.board_id = board_id
+        self.limit = limit
+        self.rows: deque = deque(maxlen=limit)   # (id, keyword, category, note) 오름차순
+        self.keyword_counts: list = []           # [(keyword, count), ...] 빈도 내림차순
+        self.last_id = 0
+        self.total = 0
+        self.version = 0                         # 내용이 바뀔 때마다 1씩 증가
+        self.generation = None                   # 마지막으로 확인한 데이터 세대 번호
+
+    def _rebuild(self):
+        self.rows.clear()
+        rows, total = get_keyword_delta(None, self.category, limit=self.limit, board_id=self.board_id)
+        self.rows.extend(rows)
+        self.last_id = rows[-1][0] if rows else 0
+        self.total = total
+
+    def sync(self, generation: int) -> bool:
+        """데이터 세대 번호가 바뀐 경우에만 refresh()를 실행합니다."""
+        if generation == self.generation:
+            return False
+        # 세대 번호를 먼저 기록: 조회 도중 들어온 커밋은 다음 세대에서 다시 반영됨
+        self.generation = generation
+        return self.refresh()
+
+    def refresh(self) -> bool:
+        """새 행만 가져와 반영합니다. 내용이 바뀌었으면 True."""
+        rows, total = get_keyword_delta(self.last_id, self.category, limit=self.limit + 1, board_id=self.board_id)
+        if len(rows) > self.limit or total != self.total + len(rows):
+            # 새 행이 너무 많거나 삭제/초기화가 일어난 경우: 처음부터 다시 구성
+            self._rebuild()
+        elif rows:
+            self.rows.extend(rows)
+            self.last_id = rows[-1][0]
+            self.total = total
+        else:
+            return False
+        # 빈도는 집계 테이블에서 다시 읽음 (O(고유 키워드 수), 같은 세대면 세션 간 공유 캐시)
+        self.keyword_counts = get_keyword_counts(category=self.category, board_id=self.board_id)
+        self.version += 1
+        return True
@@ -0,0 +1,174 @@
+"""
+WAL 체크포인트 + DB 유지보수 백그라운드 작업 (프로세스당 스레드 1개).
+
+SQLite는 기본적으로 커밋할 때 WAL이 1000페이지를 넘으면 자동 체크포인트를 시도하지만,
+대시보드가 계속 읽고 있으면 체크포인트가 WAL 끝까지 가지 못해 keywords.db-wal이 계속
+커지고, 읽기도 긴 WAL을 거쳐야 해서 느려집니다. 이 스레드는 주기적으로:
+
+- WAL이 일정 크기를 넘으면 PASSIVE 체크포인트 (읽기/쓰기를 막지 않음)
+- 쓰기가 한동안 없거나(idle) WAL이 너무 커지면 RESTART 체크포인트 (다음 쓰기가 WAL 처음부터 시작)
+- 일정 간격으로 PRAGMA optimize (필요한 테이블만 ANALYZE)
+- 대량 삭제(보관 등) 뒤 빈 페이지가 쌓이면 incremental VACUUM으로 파일 크기 반환
+
+을 실행하고, WAL 크기/체크포인트 시간/반환한 페이지 수를 stats()로 보고합니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+TICK_SECONDS = 5
+WAL_PASSIVE_BYTES = 4 * 1024 * 1024     # 이 크기를 넘으면 PASSIVE 체크포인트
+WAL_RESTART_BYTES = 32 * 1024 * 1024    # 쓰기 중이어도 이 크기를 넘으면 RESTART
+IDLE_SECONDS = 30                       # 마지막 쓰기 후 이만큼 지나면 idle로 보고 RESTART
+OPTIMIZE_SECONDS = 60 * 60              # PRAGMA optimize 간격
+VACUUM_MIN_FREE_PAGES = 256             # 빈 페이지가 이보다 많으면 incremental VACUUM
+VACUUM_STEP_PAGES = 2000                # 한 번에 반환하는 최대 페이지 수 (쓰기 잠금 시간 제한)
+
+SCHEMAS = ("main", "archive")
+
+
+class Maintenance:
+    def __init__(self, pool, interval: float = TICK_SECONDS):
+        self.pool = pool
+        self.interval = interval
+        self._wal_paths = {"main": pool.path + "-wal", "archive": pool.archive_path + "-wal"}
+        self._last_checkpointed_write = None
+        self._last_optimize = time.monotonic()
+        self._vacuum_requested = False
+        self._incremental_ready = False
+        self._lock = threading.Lock()
+        self._stats = {
+            "checkpoints": 0,
+            "last_checkpoint_mode": None,
+            "last_checkpoint_ms": None,
+            "last_checkpoint_frames": None,
+            "last_checkpoint_busy": None,
+            "pages_reclaimed": 0,
+            "last_pages_reclaimed": 0,
+            "optimize_runs": 0,
+            "errors": 0,
+            "last_error": None,
+        }
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="liveboard-maintenance", daemon=True)
+        self._thread.start()
+
+    # ---- 측정 ----
+
+    def wal_bytes(self) -> dict[str, int]:
+        sizes = {}
+        for schema, path in self._wal_paths.items():
+            try:
+                sizes[schema] = os.path.getsize(path)
+            except OSError:
+                sizes[schema] = 0
+        return sizes
+
+    def _idle(self) -> bool:
+        return time.monotonic() - self.pool.last_write >= IDLE_SECONDS
+
+    # ---- 작업 ----
+
+    def _enable_incremental_vacuum(self, conn: sqlite3.Connection):
+        # auto_vacuum 모드 변경은 VACUUM을 한 번 해야 적용됨 (idle일 때 한 번만)
+        for schema in SCHEMAS:
+            if conn.execute(f"PRAGMA {schema}.auto_vacuum").fetchone()[0] != 2:
+                conn.execute(f"PRAGMA {schema}.auto_vacuum=INCREMENTAL")
+                conn.execute(f"VACUUM {schema}")
+        self._incremental_ready = True
+
+    def checkpoint(self, mode: str = "PASSIVE") -> tuple:
+        """모든 스키마의 WAL을 체크포인트합니다. 반환: (busy, WAL 프레임 수, 체크포인트된 프레임 수)"""
+        with self.pool.exclusive() as conn:
+            started = time.perf_counter()
+            result = (0, 0, 0)
+            for schema in SCHEMAS:
+                busy, frames, done = conn.execute(f"PRAGMA {schema}.wal_checkpoint({mode})").fetchone()
+                result = (result[0] or busy, result[1] + max(frames, 0), result[2] + max(done, 0))
+            elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats["checkpoints"] += 1
+            self._stats["last_checkpoint_mode"] = mode
+            self._stats["last_checkpoint_ms"] = round(elapsed, 1)
+            self._stats["last_checkpoint_frames"] = result[1]
+            self._stats["last_checkpoint_busy"] = bool(result[0])
+        return result
+
+    def vacuum(self, max_pages: int = VACUUM_STEP_PAGES) -> int:
+        """빈 페이지를 파일에서 반환합니다 (incremental VACUUM). 반환: 반환한 페이지 수"""
+        reclaimed = 0
+        with self.pool.exclusive() as conn:
+            if not self._incremental_ready:
+                self._enable_incremental_vacuum(conn)
+            for schema in SCHEMAS:
+                before = conn.execute(f"PRAGMA {schema}.freelist_count").fetchone()[0]
+                if before:
+                    conn.execute(f"PRAGMA {schema}.incremental_vacuum({max_pages})").fetchall()
+                    reclaimed += before - conn.execute(f"PRAGMA {schema}.freelist_count").fetchone()[0]
+        with self._lock:
+            self._stats["pages_reclaimed"] += reclaimed
+            self._stats["last_pages_reclaimed"] = reclaimed
+        return reclaimed
+
+    def optimize(self):
+        with self.pool.exclusive() as conn:
+            conn.execute("PRAGMA optimize")
+        self._last_optimize = time.monotonic()
+        with self._lock:
+            self._stats["optimize_runs"] += 1
+
+    def request_vacuum(self):
+        """대량 삭제 직후 호출: 다음 주기에 빈 페이지 수와 상관없이 incremental VACUUM 실행."""
+        self._vacuum_requested = True
+
+    def _free_pages(self) -> int:
+        with self.pool.reader() as conn:
+            return sum(conn.execute(f"PRAGMA {schema}.freelist_count").fetchone()[0] for schema in SCHEMAS)
+
+    def run_once(self):
+        """한 주기 분량의 유지보수를 실행합니다. (필요한 작업만)"""
+        idle = self._idle()
+        last_write = self.pool.last_write
+        # 마지막으로 끝까지 체크포인트한 뒤 쓰기가 없었으면 WAL에 옮길 내용이 없음
+        if last_write != self._last_checkpointed_write:
+            wal = sum(self.wal_bytes().values())
+            if wal >= WAL_RESTART_BYTES or (idle and wal):
+                busy, _frames, _done = self.checkpoint("RESTART")
+                if not busy:
+                    self._last_checkpointed_write = last_write
+            elif wal >= WAL_PASSIVE_BYTES:
+                self.checkpoint("PASSIVE")
+
+        if self._vacuum_requested or (idle and self._free_pages() >= VACUUM_MIN_FREE_PAGES):
+            self._vacuum_requested = False
+            self.vacuum()
+
+        if idle and time.monotonic() - self._last_optimize >= OPTIMIZE_SECONDS:
+            self.optimize()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except sqlite3.Error as e:
+                # 잠금 경합 등은 다음 주기에 다시 시도
+                with self._lock:
+                    self._stats["errors"] += 1
+                    self._stats["last_error"] = str(e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["wal_bytes"] = self.wal_bytes()
+        stats["idle_seconds"] = round(time.monotonic() - self.pool.last_write, 1)
+        return stats
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(self.interval * 2)
+        try:
+            # 종료 전에 통계를 갱신해 두면 다음 실행의 쿼리 플랜에 도움이 됨
+            self.optimize()
+        except sqlite3.Error:
+            pass
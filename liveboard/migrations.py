@@ -0,0 +1,402 @@
+"""
+스키마 마이그레이션.
+
+현재 스키마 버전은 DB 파일의 PRAGMA user_version에 저장됩니다.
+프로세스가 시작될 때(연결 풀 생성 시) 한 번만 migrate()를 실행해서
+아직 적용되지 않은 번호의 마이그레이션만 순서대로 적용합니다.
+그 이후 페이지 코드는 항상 최신 스키마라고 가정해도 됩니다.
+
+새 마이그레이션은 MIGRATIONS 목록 끝에 (다음 번호, 함수)로 추가하세요.
+이미 배포된 마이그레이션은 수정하지 않습니다.
+"""
+import sqlite3
+
+
+def _m001_keywords_table(conn: sqlite3.Connection):
+    # 기본 테이블 생성
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS keywords (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyword TEXT NOT NULL,
+            category TEXT NOT NULL DEFAULT 'Else',
+            grade TEXT NOT NULL DEFAULT '2학년',
+            class_num INTEGER NOT NULL DEFAULT 1,
+            student_no INTEGER NOT NULL DEFAULT 1,
+            student_name TEXT NOT NULL DEFAULT '',
+            note TEXT NOT NULL DEFAULT '',
+            ts TEXT NOT NULL,
+            week INTEGER
+        )
+    """)
+    # user_version이 생기기 전의 DB는 컬럼 구성이 제각각이므로, 빠진 컬럼만 채워 넣음
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(keywords)").fetchall()]
+    legacy_columns = [
+        ("category", "TEXT DEFAULT 'Else'"),
+        ("grade", "TEXT DEFAULT '2학년'"),
+        ("class_num", "INTEGER DEFAULT 1"),
+        ("student_no", "INTEGER DEFAULT 1"),
+        ("student_name", "TEXT DEFAULT ''"),
+        ("note", "TEXT DEFAULT ''"),
+        # week 컬럼은 NULL 허용: 과거 데이터엔 비워두고, 이후 저장 시 채움
+        ("week", "INTEGER"),
+    ]
+    for name, decl in legacy_columns:
+        if name not in cols:
+            conn.execute(f"ALTER TABLE keywords ADD COLUMN {name} {decl}")
+
+
+def _m002_query_indexes(conn: sqlite3.Connection):
+    # 페이지별 조회 패턴에 맞춘 인덱스 (rowid=id는 모든 인덱스 끝에 암묵적으로 포함됨)
+    # - get_keywords / get_category_counts: WHERE category = ? ORDER BY id DESC, GROUP BY category
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_keywords_category_id ON keywords (category, id)")
+    # - get_explanations_by_keyword: WHERE keyword = ? [AND category = ?] ORDER BY id DESC
+    # - get_unique_keywords: SELECT DISTINCT keyword
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_keywords_keyword_category_id ON keywords (keyword, category, id)")
+    # - Teacher's Page: 주차 범위 + 반 + 카테고리 필터, 키워드 집계
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_keywords_week_class_category_keyword ON keywords (week, class_num, category, keyword)")
+    # 플래너가 새 인덱스를 바로 활용하도록 통계 갱신
+    conn.execute("ANALYZE keywords")
+
+
+def _m003_rollup_tables(conn: sqlite3.Connection):
+    # 실시간 보드용 집계 테이블 — 원본 행을 다시 세지 않고 트리거로 카운트만 유지
+    # (week를 모르는 과거 행은 week = 0으로 집계: PK에 NULL이 들어가지 않도록)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS stats_category (
+            category TEXT PRIMARY KEY,
+            cnt INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS stats_keyword (
+            keyword TEXT NOT NULL,
+            category TEXT NOT NULL,
+            cnt INTEGER NOT NULL,
+            PRIMARY KEY (keyword, category)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_stats_keyword_category ON stats_keyword (category, keyword)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS stats_keyword_week_class (
+            keyword TEXT NOT NULL,
+            category TEXT NOT NULL,
+            week INTEGER NOT NULL,
+            class_num INTEGER NOT NULL,
+            cnt INTEGER NOT NULL,
+            PRIMARY KEY (week, class_num, category, keyword)
+        ) WITHOUT ROWID
+    """)
+
+    # 행 추가/삭제 시 카운트 증감 (UPDATE는 기존 값 -1, 새 값 +1)
+    add = """
+        INSERT INTO stats_category (category, cnt) VALUES ({r}.category, 1)
+            ON CONFLICT (category) DO UPDATE SET cnt = cnt + 1;
+        INSERT INTO stats_keyword (keyword, category, cnt) VALUES ({r}.keyword, {r}.category, 1)
+            ON CONFLICT (keyword, category) DO UPDATE SET cnt = cnt + 1;
+        INSERT INTO stats_keyword_week_class (keyword, category, week, class_num, cnt)
+            VALUES ({r}.keyword, {r}.category, IFNULL({r}.week, 0), {r}.class_num, 1)
+            ON CONFLICT (week, class_num, category, keyword) DO UPDATE SET cnt = cnt + 1;
+    """
+    remove = """
+        UPDATE stats_category SET cnt = cnt - 1 WHERE category = {r}.category;
+        DELETE FROM stats_category WHERE category = {r}.category AND cnt <= 0;
+        UPDATE stats_keyword SET cnt = cnt - 1 WHERE keyword = {r}.keyword AND category = {r}.category;
+        DELETE FROM stats_keyword WHERE keyword = {r}.keyword AND category = {r}.category AND cnt <= 0;
+        UPDATE stats_keyword_week_class SET cnt = cnt - 1
+            WHERE week = IFNULL({r}.week, 0) AND class_num = {r}.class_num AND category = {r}.category AND keyword = {r}.keyword;
+        DELETE FROM stats_keyword_week_class
+            WHERE week = IFNULL({r}.week, 0) AND class_num = {r}.class_num AND category = {r}.category AND keyword = {r}.keyword AND cnt <= 0;
+    """
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_keywords_stats_insert AFTER INSERT ON keywords BEGIN
+            {add.format(r="NEW")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_keywords_stats_delete AFTER DELETE ON keywords BEGIN
+            {remove.format(r="OLD")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_keywords_stats_update
+        AFTER UPDATE OF keyword, category, week, class_num ON keywords BEGIN
+            {remove.format(r="OLD")}
+            {add.format(r="NEW")}
+        END
+    """)
+
+    # 기존 데이터로 한 번 채우기
+    conn.execute("DELETE FROM stats_category")
+    conn.execute("DELETE FROM stats_keyword")
+    conn.execute("DELETE FROM stats_keyword_week_class")
+    conn.execute("INSERT INTO stats_category (category, cnt) SELECT category, COUNT(*) FROM keywords GROUP BY category")
+    conn.execute("INSERT INTO stats_keyword (keyword, category, cnt) SELECT keyword, category, COUNT(*) FROM keywords GROUP BY keyword, category")
+    conn.execute("""
+        INSERT INTO stats_keyword_week_class (keyword, category, week, class_num, cnt)
+        SELECT keyword, category, IFNULL(week, 0), class_num, COUNT(*) FROM keywords
+        GROUP BY IFNULL(week, 0), class_num, category, keyword
+    """)
+
+
+def _m004_academic_calendar(conn: sqlite3.Connection):
+    # 학사 일정: 수업 주차 경계(월~일)와 휴일 — 제출 시각으로 주차를 계산할 때 사용
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS academic_weeks (
+            week INTEGER PRIMARY KEY,
+            start_date TEXT NOT NULL UNIQUE,
+            end_date TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS academic_holidays (
+            day TEXT PRIMARY KEY,
+            name TEXT NOT NULL DEFAULT ''
+        ) WITHOUT ROWID
+    """)
+
+
+def _m005_ts_epoch(conn: sqlite3.Connection):
+    # 정수 epoch(초) 컬럼 — 시간 범위 조회/분 단위 집계를 문자열 파싱 없이 인덱스로 처리
+    # (오프셋이 없는 과거 ts 문자열은 SQLite 규칙대로 UTC로 해석됨)
+    conn.execute("ALTER TABLE keywords ADD COLUMN ts_epoch INTEGER")
+    conn.execute("UPDATE keywords SET ts_epoch = CAST(strftime('%s', ts) AS INTEGER)")
+    # (ts_epoch, category): 구간 조회 + 카테고리별 버킷 집계를 인덱스만으로 처리
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_keywords_ts_epoch_category ON keywords (ts_epoch, category)")
+
+
+def _m006_boards(conn: sqlite3.Connection):
+    # 보드(수업 단위): 초기화는 행을 지우지 않고 새 보드를 여는 것(O(1))으로 대체.
+    # 가장 최근에 연 보드(MAX(id))가 현재 보드이며, 지난 보드는 Teacher's Page에서 계속 조회 가능.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS boards (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL,
+            created_epoch INTEGER NOT NULL
+        )
+    """)
+    first = conn.execute("SELECT MIN(ts), MIN(ts_epoch) FROM keywords").fetchone()
+    conn.execute(
+        "INSERT INTO boards (name, created_at, created_epoch) VALUES ('기존 데이터', COALESCE(?, datetime('now')), COALESCE(?, CAST(strftime('%s', 'now') AS INTEGER)))",
+        first,
+    )
+    board_id = conn.execute("SELECT MAX(id) FROM boards").fetchone()[0]
+    conn.execute("ALTER TABLE keywords ADD COLUMN board_id INTEGER")
+    conn.execute("UPDATE keywords SET board_id = ?", (board_id,))
+
+    # 실시간 보드 조회는 모두 board_id가 맨 앞인 인덱스로
+    conn.execute("DROP INDEX IF EXISTS idx_keywords_category_id")
+    conn.execute("DROP INDEX IF EXISTS idx_keywords_keyword_category_id")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_keywords_board_id ON keywords (board_id, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_keywords_board_category_id ON keywords (board_id, category, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_keywords_board_keyword_category_id ON keywords (board_id, keyword, category, id)")
+
+    # 집계 테이블도 보드별로 다시 구성
+    for name in ("trg_keywords_stats_insert", "trg_keywords_stats_delete", "trg_keywords_stats_update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for name in ("stats_category", "stats_keyword", "stats_keyword_week_class"):
+        conn.execute(f"DROP TABLE IF EXISTS {name}")
+    conn.execute("""
+        CREATE TABLE stats_category (
+            board_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            cnt INTEGER NOT NULL,
+            PRIMARY KEY (board_id, category)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE stats_keyword (
+            board_id INTEGER NOT NULL,
+            keyword TEXT NOT NULL,
+            category TEXT NOT NULL,
+            cnt INTEGER NOT NULL,
+            PRIMARY KEY (board_id, keyword, category)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX idx_stats_keyword_category ON stats_keyword (board_id, category, keyword)")
+    conn.execute("""
+        CREATE TABLE stats_keyword_week_class (
+            keyword TEXT NOT NULL,
+            category TEXT NOT NULL,
+            week INTEGER NOT NULL,
+            class_num INTEGER NOT NULL,
+            board_id INTEGER NOT NULL,
+            cnt INTEGER NOT NULL,
+            PRIMARY KEY (week, class_num, category, keyword, board_id)
+        ) WITHOUT ROWID
+    """)
+
+    add = """
+        INSERT INTO stats_category (board_id, category, cnt) VALUES ({r}.board_id, {r}.category, 1)
+            ON CONFLICT (board_id, category) DO UPDATE SET cnt = cnt + 1;
+        INSERT INTO stats_keyword (board_id, keyword, category, cnt) VALUES ({r}.board_id, {r}.keyword, {r}.category, 1)
+            ON CONFLICT (board_id, keyword, category) DO UPDATE SET cnt = cnt + 1;
+        INSERT INTO stats_keyword_week_class (keyword, category, week, class_num, board_id, cnt)
+            VALUES ({r}.keyword, {r}.category, IFNULL({r}.week, 0), {r}.class_num, {r}.board_id, 1)
+            ON CONFLICT (week, class_num, category, keyword, board_id) DO UPDATE SET cnt = cnt + 1;
+    """
+    remove = """
+        UPDATE stats_category SET cnt = cnt - 1 WHERE board_id = {r}.board_id AND category = {r}.category;
+        DELETE FROM stats_category WHERE board_id = {r}.board_id AND category = {r}.category AND cnt <= 0;
+        UPDATE stats_keyword SET cnt = cnt - 1
+            WHERE board_id = {r}.board_id AND keyword = {r}.keyword AND category = {r}.category;
+        DELETE FROM stats_keyword
+            WHERE board_id = {r}.board_id AND keyword = {r}.keyword AND category = {r}.category AND cnt <= 0;
+        UPDATE stats_keyword_week_class SET cnt = cnt - 1
+            WHERE week = IFNULL({r}.week, 0) AND class_num = {r}.class_num AND category = {r}.category
+              AND keyword = {r}.keyword AND board_id = {r}.board_id;
+        DELETE FROM stats_keyword_week_class
+            WHERE week = IFNULL({r}.week, 0) AND class_num = {r}.class_num AND category = {r}.category
+              AND keyword = {r}.keyword AND board_id = {r}.board_id AND cnt <= 0;
+    """
+    conn.execute(f"""
+        CREATE TRIGGER trg_keywords_stats_insert AFTER INSERT ON keywords BEGIN
+            {add.format(r="NEW")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER trg_keywords_stats_delete AFTER DELETE ON keywords BEGIN
+            {remove.format(r="OLD")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER trg_keywords_stats_update
+        AFTER UPDATE OF keyword, category, week, class_num, board_id ON keywords BEGIN
+            {remove.format(r="OLD")}
+            {add.format(r="NEW")}
+        END
+    """)
+    conn.execute("INSERT INTO stats_category (board_id, category, cnt) SELECT board_id, category, COUNT(*) FROM keywords GROUP BY board_id, category")
+    conn.execute("""
+        INSERT INTO stats_keyword (board_id, keyword, category, cnt)
+        SELECT board_id, keyword, category, COUNT(*) FROM keywords GROUP BY board_id, keyword, category
+    """)
+    conn.execute("""
+        INSERT INTO stats_keyword_week_class (keyword, category, week, class_num, board_id, cnt)
+        SELECT keyword, category, IFNULL(week, 0), class_num, board_id, COUNT(*) FROM keywords
+        GROUP BY IFNULL(week, 0), class_num, category, keyword, board_id
+    """)
+    conn.execute("ANALYZE keywords")
+
+
+def _m007_quiz_cache(conn: sqlite3.Connection):
+    # AI 퀴즈 결과 캐시: (정규화된 키워드 집합 지문, 문항 수) -> 퀴즈 JSON
+    # 서버를 다시 시작해도 유지되며, 오래된 항목은 TTL/LRU(last_used_epoch)로 정리
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS quiz_cache (
+            fingerprint TEXT NOT NULL,
+            num_questions INTEGER NOT NULL,
+            keywords TEXT NOT NULL,
+            quiz_json TEXT NOT NULL,
+            created_epoch INTEGER NOT NULL,
+            last_used_epoch INTEGER NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (fingerprint, num_questions)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_quiz_cache_last_used ON quiz_cache (last_used_epoch)")
+
+
+def _m008_quiz_questions(conn: sqlite3.Connection):
+    # 키워드별 문제 은행: 새 키워드가 처음 나왔을 때만 AI로 문제를 만들고, 퀴즈는 여기서 뽑음
+    # keyword는 정규화된 값(liveboard.quiz_cache.normalize_keyword), options는 번호 없는 보기 4개의 JSON 배열
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS quiz_questions (
+            id INTEGER PRIMARY KEY,
+            keyword TEXT NOT NULL,
+            question TEXT NOT NULL,
+            options TEXT NOT NULL,
+            answer INTEGER NOT NULL,
+            created_epoch INTEGER NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_quiz_questions_keyword ON quiz_questions (keyword)")
+
+
+def ensure_archive_schema(conn: sqlite3.Connection, schema: str = "archive"):
+    """
+    보관(archive) DB의 스키마를 만듭니다. (ATTACH된 별도 파일)
+    보관 파일은 user_version과 따로 움직이므로(지우거나 새로 만들 수 있음) 매번 IF NOT EXISTS로 확인합니다.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # 원본 행: main.keywords와 같은 컬럼 순서, id도 그대로 유지
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {schema}.keywords (
+                id INTEGER PRIMARY KEY,
+                keyword TEXT NOT NULL,
+                category TEXT NOT NULL,
+                grade TEXT,
+                class_num INTEGER,
+                student_no INTEGER,
+                student_name TEXT,
+                note TEXT,
+                ts TEXT,
+                week INTEGER NOT NULL,
+                ts_epoch INTEGER,
+                board_id INTEGER
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_keywords_week_class_category_keyword ON keywords (week, class_num, category, keyword)")
+        # 주차×반×카테고리×키워드 집계 (보관할 때 주차 단위로 다시 계산)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {schema}.stats_keyword_week_class (
+                keyword TEXT NOT NULL,
+                category TEXT NOT NULL,
+                week INTEGER NOT NULL,
+                class_num INTEGER,
+                board_id INTEGER NOT NULL,
+                cnt INTEGER NOT NULL,
+                PRIMARY KEY (week, class_num, category, keyword, board_id)
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_stats_keyword_week_class_board ON stats_keyword_week_class (board_id)")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+# (버전 번호, 마이그레이션 함수) — 번호는 1부터 빠짐없이 증가
+MIGRATIONS = [
+    (1, _m001_keywords_table),
+    (2, _m002_query_indexes),
+    (3, _m003_rollup_tables),
+    (4, _m004_academic_calendar),
+    (5, _m005_ts_epoch),
+    (6, _m006_boards),
+    (7, _m007_quiz_cache),
+    (8, _m008_quiz_questions),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    아직 적용되지 않은 마이그레이션을 적용하고 최종 버전을 반환합니다.
+    각 마이그레이션은 user_version 갱신과 함께 하나의 트랜잭션으로 커밋되므로,
+    중간에 실패하면 해당 번호는 적용되지 않은 상태로 남습니다.
+    """
+    if get_version(conn) >= LATEST_VERSION:
+        return get_version(conn)
+
+    for version, step in MIGRATIONS:
+        # BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡은 뒤 버전을 다시 확인
+        # (여러 서버 프로세스가 동시에 시작해도 한 번만 적용됨)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_version(conn) >= version:
+                conn.rollback()
+                continue
+            step(conn)
+            conn.execute(f"PRAGMA user_version={version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return get_version(conn)
@@ -0,0 +1,81 @@
+"""
+데이터 변경 감지 (프로세스당 백그라운드 감시 스레드 1개).
+
+PRAGMA data_version은 "다른 연결"이 커밋할 때마다 값이 바뀝니다. 감시 스레드가 자기 전용
+연결로 이 값을 주기적으로 확인하고, 바뀌었으면 데이터 세대(generation) 번호를 1 올립니다.
+같은 프로세스의 쓰기 큐든 다른 서버 프로세스든 모든 커밋이 감지됩니다.
+
+각 브라우저 탭은 SQLite를 직접 폴링하지 않고 메모리의 세대 번호만 비교해서,
+번호가 바뀐 경우에만 DB를 다시 읽습니다.
+"""
+import atexit
+import sqlite3
+import threading
+
+from liveboard.db import get_pool
+
+POLL_INTERVAL = 0.5   # 초
+
+
+class DataWatcher:
+    def __init__(self, path: str, interval: float = POLL_INTERVAL):
+        self.interval = interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA query_only=ON;")
+        self._last_version = self._data_version()
+        self._generation = 1
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="liveboard-watcher", daemon=True)
+        self._thread.start()
+
+    def _data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                version = self._data_version()
+            except sqlite3.Error:
+                continue
+            if version != self._last_version:
+                self._last_version = version
+                with self._cond:
+                    self._generation += 1
+                    self._cond.notify_all()
+
+    def wait_for_change(self, generation: int, timeout: float | None = None) -> int:
+        """세대 번호가 generation과 달라질 때까지(또는 timeout까지) 기다린 뒤 현재 번호를 반환합니다."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._generation != generation, timeout)
+            return self._generation
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(self.interval * 2)
+        self._conn.close()
+
+
+_watcher: DataWatcher | None = None
+_watcher_lock = threading.Lock()
+
+
+def get_watcher() -> DataWatcher:
+    """프로세스 전체에서 공유하는 감시 스레드 (처음 호출될 때 한 번만 시작)."""
+    global _watcher
+    if _watcher is None:
+        pool = get_pool()
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = DataWatcher(pool.path)
+                atexit.register(_watcher.close)
+    return _watcher
+
+
+def current_generation() -> int:
+    """현재 데이터 세대 번호 (DB를 읽지 않고 메모리 값만 반환)."""
+    return get_watcher().generation
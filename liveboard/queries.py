@@ -0,0 +1,32 @@
+"""
+페이지에서 쓰는 조회 함수 (공유 결과 캐시 적용).
+
+liveboard.db의 같은 이름 함수를 캐시로 감싼 것입니다. 쓰기 함수와 세션별 증분 조회
+(get_keyword_delta)는 캐시하지 않으므로 liveboard.db에서 직접 가져다 쓰세요.
+"""
+from liveboard import db
+from liveboard.cache import cached_query, result_cache
+
+get_keywords = cached_query(db.get_keywords)
+get_explanations_by_keyword = cached_query(db.get_explanations_by_keyword)
+get_category_counts = cached_query(db.get_category_counts)
+get_keyword_counts = cached_query(db.get_keyword_counts)
+get_unique_keywords = cached_query(db.get_unique_keywords)
+get_keyword_notes = cached_query(db.get_keyword_notes)
+get_filtered_items = cached_query(db.get_filtered_items)
+get_top_keywords_by_week = cached_query(db.get_top_keywords_by_week)
+get_week_range = cached_query(db.get_week_range)
+get_total_count = cached_query(db.get_total_count)
+get_submissions_between = cached_query(db.get_submissions_between)
+get_submission_buckets = cached_query(db.get_submission_buckets)
+get_active_board = cached_query(db.get_active_board)
+list_boards = cached_query(db.list_boards)
+
+
+def cache_stats() -> dict:
+    """공유 캐시 적중/미스 통계 (캐시 크기 조정용)."""
+    return result_cache.stats()
+
+
+def clear_cache():
+    result_cache.clear()
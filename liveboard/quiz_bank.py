@@ -0,0 +1,206 @@
+"""
+키워드별 퀴즈 문제 은행 (quiz_questions 테이블).
+
+예전에는 퀴즈를 만들 때마다 전체 키워드 목록으로 AI에 한 번에 요청해서, 비용이 전체 어휘 수에
+비례했습니다. 이제는 은행에 아직 없는 키워드만 작은 묶음(BATCH_SIZE)으로 AI에 보내 키워드마다
+PER_KEYWORD개의 문제를 저장하고, "✨ 새 퀴즈 생성 ✨"은 은행에서 문제를 뽑기만 합니다.
+(AI 호출 수는 새 어휘 수에 비례, 퀴즈 만들기는 DB 조회 한 번)
+
+AI 응답은 배치 키워드 집합 기준으로 퀴즈 캐시(liveboard.quiz_cache)에도 남기므로,
+은행에 저장하기 전에 실패해도 같은 배치에 대해 다시 비용을 쓰지 않습니다.
+배치 채우기는 AI 호출 관문(liveboard.ai_gate)을 거치므로 여러 세션이 같은 새 키워드로
+동시에 버튼을 눌러도 배치마다 한 번만 생성합니다.
+start_fill()은 배치를 보내기만 하고 바로 반환하므로, 페이지는 먼저 끝난 배치의 문제부터
+퀴즈에 이어 붙일 수 있습니다. (extend_quiz)
+"""
+import json
+import random
+import re
+import time
+from concurrent.futures import wait
+
+from liveboard.ai_gate import get_ai_gate
+from liveboard.db import get_pool
+from liveboard.quiz_cache import canonical_keywords, get_or_generate_quiz, keyword_fingerprint, normalize_keyword
+
+BATCH_SIZE = 2          # 한 번의 AI 요청에 넣는 새 키워드 수 (작게 나눠 병렬로 보내고 먼저 끝난 것부터 표시)
+PER_KEYWORD = 2         # 키워드마다 만들어 두는 문제 수
+QUIZ_TITLE = "오늘의 영어 질문 키워드 퀴즈"
+PROGRESS_INTERVAL = 0.5  # 기다리는 동안 진행 상태를 알리는 간격 (초)
+
+_OPTION_PREFIX = re.compile(r"^\s*\d+\s*[.)]\s*")
+
+
+def missing_keywords(keywords) -> list[str]:
+    """은행에 문제가 하나도 없는 키워드 (정규화된 값)."""
+    canonical = canonical_keywords(keywords)
+    if not canonical:
+        return []
+    with get_pool().reader() as conn:
+        have = {r[0] for r in conn.execute(
+            f"SELECT DISTINCT keyword FROM quiz_questions WHERE keyword IN ({', '.join('?' * len(canonical))})",
+            canonical,
+        )}
+    return [k for k in canonical if k not in have]
+
+
+def _clean_question(q: dict, batch: set) -> tuple | None:
+    """AI가 만든 문제 하나를 (keyword, question, options JSON, answer)로 정리. 형식이 틀리면 None."""
+    try:
+        keyword = normalize_keyword(str(q["keyword"]))
+        options = [_OPTION_PREFIX.sub("", str(o)).strip() for o in q["options"]]
+        answer = int(q["answer"])
+        question = str(q["question"]).strip()
+    except (KeyError, TypeError, ValueError):
+        return None
+    if keyword not in batch or len(options) != 4 or not 1 <= answer <= 4 or not question:
+        return None
+    return keyword, question, json.dumps(options, ensure_ascii=False), answer
+
+
+def add_questions(questions, batch) -> int:
+    """
+    AI 응답의 문제 목록을 은행에 저장하고 저장한 개수를 반환합니다.
+    그 사이 다른 세션/프로세스가 이미 채운 키워드는 건너뜁니다. (쓰기 트랜잭션 안에서 확인)
+    """
+    batch = set(canonical_keywords(batch))
+    rows = [r for r in (_clean_question(q, batch) for q in questions) if r is not None]
+    if not rows:
+        return 0
+    now = int(time.time())
+    with get_pool().writer() as conn:
+        keywords = sorted({r[0] for r in rows})
+        filled = {r[0] for r in conn.execute(
+            f"SELECT DISTINCT keyword FROM quiz_questions WHERE keyword IN ({', '.join('?' * len(keywords))})", keywords
+        )}
+        rows = [r for r in rows if r[0] not in filled]
+        conn.executemany(
+            "INSERT INTO quiz_questions (keyword, question, options, answer, created_epoch) VALUES (?, ?, ?, ?, ?)",
+            [(*r, now) for r in rows],
+        )
+    return len(rows)
+
+
+def _fill_batch(batch: list[str], per_keyword: int, generate) -> int:
+    # 대기열에 있는 동안 다른 요청이 채웠을 수 있으므로 다시 확인
+    batch = missing_keywords(batch)
+    if not batch:
+        return 0
+    result, _cached = get_or_generate_quiz(batch, per_keyword * len(batch), generate)
+    return add_questions(result.get("questions", []), batch) if result else 0
+
+
+def start_fill(keywords, generate, batch_size: int = BATCH_SIZE, per_keyword: int = PER_KEYWORD) -> list[tuple]:
+    """
+    은행에 없는 키워드를 batch_size개씩 나눠 AI 호출 관문에 보내고 바로 반환합니다. (기다리지 않음)
+    generate는 {"questions": [{"keyword", "question", "options", "answer"}, ...]}를 반환해야 합니다.
+    배치는 관문에서 합쳐지고(같은 배치는 한 번만) 속도/동시 호출 수 제한과 재시도를 거칩니다.
+    반환: [(관문 키, 배치 키워드 목록, Future), ...] — Future 결과는 저장한 문제 수
+    """
+    new = missing_keywords(keywords)
+    gate = get_ai_gate()
+    jobs = []
+    for i in range(0, len(new), batch_size):
+        batch = new[i:i + batch_size]
+        key = ("quiz_bank", keyword_fingerprint(batch), per_keyword)
+        jobs.append((key, batch, gate.submit(key, _fill_batch, batch, per_keyword, generate)))
+    return jobs
+
+
+def job_states(jobs) -> list:
+    """start_fill() 작업들의 상태 (queued/throttled/running, 끝났으면 None)."""
+    gate = get_ai_gate()
+    return [None if fut.done() else gate.state(key) for key, _batch, fut in jobs]
+
+
+def fill_bank(keywords, generate, batch_size: int = BATCH_SIZE, per_keyword: int = PER_KEYWORD, on_progress=None) -> int:
+    """
+    start_fill()로 보낸 배치가 모두 끝날 때까지 기다립니다.
+    on_progress(상태 목록)는 기다리는 동안 PROGRESS_INTERVAL마다 호출됩니다.
+    반환: 새로 저장한 문제 수 (실패한 배치가 있으면 나머지를 기다린 뒤 첫 예외를 다시 발생)
+    """
+    jobs = start_fill(keywords, generate, batch_size, per_keyword)
+    pending = {fut for _key, _batch, fut in jobs}
+    while pending:
+        if on_progress is not None:
+            on_progress(job_states(jobs))
+        _done, pending = wait(pending, timeout=PROGRESS_INTERVAL)
+
+    added = 0
+    for _key, _batch, fut in jobs:
+        added += fut.result()
+    return added
+
+
+def sample_quiz(keywords, num_questions: int, rng: random.Random | None = None, exclude=()) -> dict | None:
+    """
+    은행에서 퀴즈를 뽑습니다. 되도록 서로 다른 키워드에서 한 문제씩 고르고, 보기 순서도 섞습니다.
+    exclude에 있는 질문 문장은 고르지 않습니다. (이미 낸 문제에 이어 붙일 때)
+    반환 형식은 AI 퀴즈와 같습니다. 은행에 해당 키워드 문제가 없으면 None.
+    """
+    rng = rng or random.Random()
+    canonical = canonical_keywords(keywords)
+    if not canonical:
+        return None
+    with get_pool().reader() as conn:
+        rows = conn.execute(
+            f"SELECT keyword, question, options, answer FROM quiz_questions WHERE keyword IN ({', '.join('?' * len(canonical))})",
+            canonical,
+        ).fetchall()
+    exclude = set(exclude)
+    rows = [r for r in rows if r[1] not in exclude]
+    if not rows:
+        return None
+
+    by_keyword: dict[str, list] = {}
+    for row in rows:
+        by_keyword.setdefault(row[0], []).append(row)
+    for pool in by_keyword.values():
+        rng.shuffle(pool)
+    # 키워드를 섞어서 돌아가며 한 문제씩 (키워드가 문항 수보다 적으면 두 번째 문제부터 채움)
+    order = list(by_keyword)
+    rng.shuffle(order)
+    picked = []
+    while len(picked) < num_questions and any(by_keyword[k] for k in order):
+        for k in order:
+            if by_keyword[k] and len(picked) < num_questions:
+                picked.append(by_keyword[k].pop())
+
+    questions = []
+    for q_num, (_keyword, question, options_json, answer) in enumerate(picked, start=1):
+        options = json.loads(options_json)
+        perm = list(range(len(options)))
+        rng.shuffle(perm)
+        questions.append({
+            "q_num": q_num,
+            "question": question,
+            "options": [f"{i}. {options[j]}" for i, j in enumerate(perm, start=1)],
+            "answer": perm.index(answer - 1) + 1,
+        })
+    return {"quiz_title": QUIZ_TITLE, "questions": questions}
+
+
+def extend_quiz(quiz: dict, more: dict | None, limit: int) -> int:
+    """quiz 뒤에 more의 문제를 limit개까지 이어 붙이고(q_num 다시 매김) 붙인 개수를 반환합니다."""
+    if not more:
+        return 0
+    questions = quiz["questions"]
+    added = 0
+    for q in more["questions"]:
+        if len(questions) >= limit:
+            break
+        questions.append({**q, "q_num": len(questions) + 1})
+        added += 1
+    return added
+
+
+def bank_size(keywords=None) -> int:
+    with get_pool().reader() as conn:
+        if keywords is None:
+            return conn.execute("SELECT COUNT(*) FROM quiz_questions").fetchone()[0]
+        canonical = canonical_keywords(keywords)
+        if not canonical:
+            return 0
+        return conn.execute(
+            f"SELECT COUNT(*) FROM quiz_questions WHERE keyword IN ({', '.join('?' * len(canonical))})", canonical
+        ).fetchone()[0]
@@ -0,0 +1,90 @@
+"""
+AI 퀴즈 결과를 SQLite에 저장해 두는 영구 캐시.
+
+키는 (키워드 집합 지문, 문항 수)입니다. 지문은 키워드를 정규화(NFKC, 공백 정리, 소문자)하고
+중복을 없앤 뒤 정렬한 목록의 해시라서, 조회 순서가 바뀌거나 같은 키워드가 한 번 더
+제출되어도 같은 키가 됩니다. 다른 세션이나 서버 재시작 뒤에도 같은 요청은 바로 반환됩니다.
+
+- TTL: QUIZ_TTL_SECONDS가 지난 항목은 쓰지 않고 정리
+- LRU: 항목이 MAX_ENTRIES를 넘으면 가장 오래 쓰이지 않은 것부터 삭제
+  (사용 시각은 TOUCH_SECONDS마다 한 번만 갱신 — 조회마다 쓰기가 일어나 데이터 세대가 바뀌지 않도록)
+"""
+import hashlib
+import json
+import time
+import unicodedata
+
+from liveboard.db import get_pool
+
+QUIZ_TTL_SECONDS = 7 * 24 * 60 * 60
+MAX_ENTRIES = 200
+TOUCH_SECONDS = 10 * 60
+
+
+def normalize_keyword(keyword: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", keyword).split()).casefold()
+
+
+def canonical_keywords(keywords) -> list[str]:
+    """정규화 + 중복 제거 + 정렬한 키워드 목록 (프롬프트와 캐시 키에 같은 목록을 씀)."""
+    return sorted({normalize_keyword(k) for k in keywords if k and normalize_keyword(k)})
+
+
+def keyword_fingerprint(keywords) -> str:
+    payload = json.dumps(canonical_keywords(keywords), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_quiz(keywords, num_questions: int, now: float | None = None) -> dict | None:
+    """캐시된 퀴즈 (없거나 TTL이 지났으면 None)."""
+    now = int(time.time() if now is None else now)
+    key = (keyword_fingerprint(keywords), int(num_questions))
+    with get_pool().reader() as conn:
+        row = conn.execute(
+            "SELECT quiz_json, created_epoch, last_used_epoch FROM quiz_cache WHERE fingerprint = ? AND num_questions = ?",
+            key,
+        ).fetchone()
+    if row is None or now - row[1] > QUIZ_TTL_SECONDS:
+        return None
+    if now - row[2] >= TOUCH_SECONDS:
+        with get_pool().writer() as conn:
+            conn.execute(
+                "UPDATE quiz_cache SET last_used_epoch = ?, hits = hits + 1 WHERE fingerprint = ? AND num_questions = ?",
+                (now, *key),
+            )
+    return json.loads(row[0])
+
+
+def put_cached_quiz(keywords, num_questions: int, quiz: dict, now: float | None = None):
+    """퀴즈를 저장하고 TTL이 지난 항목/LRU 초과분을 정리합니다."""
+    now = int(time.time() if now is None else now)
+    canonical = canonical_keywords(keywords)
+    with get_pool().writer() as conn:
+        conn.execute(
+            """INSERT OR REPLACE INTO quiz_cache
+               (fingerprint, num_questions, keywords, quiz_json, created_epoch, last_used_epoch, hits)
+               VALUES (?, ?, ?, ?, ?, ?, 0)""",
+            (keyword_fingerprint(canonical), int(num_questions), json.dumps(canonical, ensure_ascii=False),
+             json.dumps(quiz, ensure_ascii=False), now, now),
+        )
+        conn.execute("DELETE FROM quiz_cache WHERE created_epoch < ?", (now - QUIZ_TTL_SECONDS,))
+        conn.execute("""
+            DELETE FROM quiz_cache WHERE (fingerprint, num_questions) IN (
+                SELECT fingerprint, num_questions FROM quiz_cache
+                ORDER BY last_used_epoch DESC LIMIT -1 OFFSET ?
+            )
+        """, (MAX_ENTRIES,))
+
+
+def get_or_generate_quiz(keywords, num_questions: int, generate) -> tuple[dict | None, bool]:
+    """
+    캐시에 있으면 바로 반환하고, 없으면 generate(정규화된 키워드 목록, 문항 수)를 호출해 저장합니다.
+    반환: (퀴즈 또는 None, 캐시 적중 여부) — 생성 실패(None)는 저장하지 않음
+    """
+    quiz = get_cached_quiz(keywords, num_questions)
+    if quiz is not None:
+        return quiz, True
+    quiz = generate(canonical_keywords(keywords), num_questions)
+    if quiz:
+        put_cached_quiz(keywords, num_questions, quiz)
+    return quiz, False
@@ -0,0 +1,211 @@
+"""
+저장소(백엔드) 인터페이스.
+
+페이지가 쓰는 기본 연산(제출 저장, 최근 제출, 카테고리별 개수, 키워드별 부연 설명,
+고유 키워드, Teacher's Page 필터 조회)을 StorageBackend 하나로 묶었습니다.
+
+- SQLiteStorage: liveboard.db의 함수를 그대로 쓰는 기본 구현 (실제 서비스)
+- MemoryStorage: dict + 정렬된 id 목록 인덱스만 쓰는 순수 메모리 구현
+  (디스크 I/O 없이 대시보드 로직만 부하 테스트하거나, 같은 작업량으로 엔진을 비교할 때)
+
+두 구현은 같은 입력에 같은 결과(행 형태/정렬 순서)를 돌려줘야 합니다.
+LIVEBOARD_STORAGE 환경 변수로 get_storage()가 고를 구현을 바꿀 수 있습니다. (sqlite | memory)
+"""
+import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from datetime import datetime
+from heapq import merge
+
+from liveboard import db
+from liveboard.academic_calendar import WeekIndex
+from liveboard.db import ITEM_COLUMNS
+
+# get_keywords()와 같은 최근 제출 행 컬럼 (ITEM_COLUMNS의 앞부분)
+RECENT_COLUMNS = ITEM_COLUMNS[:9]
+
+
+class StorageBackend:
+    """
+    저장소 연산 목록. category가 None 또는 "All"이면 카테고리 조건 없음.
+    실시간 보드용 연산은 현재 보드(가장 최근에 연 보드)만, filtered_items는 모든 보드를 봅니다.
+    """
+
+    name = "base"
+
+    def insert_submission(self, keyword: str, category: str, grade: str, class_num: int, student_no: int,
+                          student_name: str, note: str, week: int | None, ts: str | None = None) -> int:
+        """제출 한 건을 저장하고 새 id를 반환합니다. week가 None이면 학사 일정으로 주차를 찾습니다."""
+        raise NotImplementedError
+
+    def recent_submissions(self, limit: int = 500, category: str | None = None) -> list[tuple]:
+        """최근 limit건 (RECENT_COLUMNS 순서), id 오름차순."""
+        raise NotImplementedError
+
+    def category_counts(self) -> list[tuple[str, int]]:
+        """[(category, count), ...] 카테고리 이름순."""
+        raise NotImplementedError
+
+    def explanations_by_keyword(self, keyword: str, category: str | None = None, limit: int = 200) -> list[tuple]:
+        """[(student_name, class_num, student_no, note, ts), ...] 최신순."""
+        raise NotImplementedError
+
+    def distinct_keywords(self) -> list[str]:
+        """고유 키워드 목록 (이름순)."""
+        raise NotImplementedError
+
+    def filtered_items(self, class_nums=None, category: str | None = None,
+                       week_range: tuple[int, int] | None = None, board_ids=None) -> list[tuple]:
+        """Teacher's Page 필터 조회 (ITEM_COLUMNS 순서), id 오름차순."""
+        raise NotImplementedError
+
+    def open_board(self, name: str = "") -> int:
+        """새 보드를 열어 현재 보드로 만들고 id를 반환합니다. (기존 제출은 유지)"""
+        raise NotImplementedError
+
+
+class SQLiteStorage(StorageBackend):
+    """liveboard.db의 공유 연결 풀을 쓰는 구현."""
+
+    name = "sqlite"
+
+    def insert_submission(self, keyword, category, grade, class_num, student_no, student_name, note, week, ts=None):
+        return db.add_keyword(keyword, category, grade, class_num, student_no, student_name, note, week, ts)
+
+    def recent_submissions(self, limit=500, category=None):
+        return db.get_keywords(limit=limit, category=category)
+
+    def category_counts(self):
+        return db.get_category_counts()
+
+    def explanations_by_keyword(self, keyword, category=None, limit=200):
+        return db.get_explanations_by_keyword(keyword, category=category, limit=limit)
+
+    def distinct_keywords(self):
+        return sorted(db.get_unique_keywords())
+
+    def filtered_items(self, class_nums=None, category=None, week_range=None, board_ids=None):
+        return db.get_filtered_items(class_nums=class_nums, category=category, week_range=week_range, board_ids=board_ids)
+
+    def open_board(self, name=""):
+        return db.open_board(name)
+
+
+def _has_category(category: str | None) -> bool:
+    return bool(category) and category != "All"
+
+
+class MemoryStorage(StorageBackend):
+    """
+    순수 메모리 구현. 행은 id -> 튜플 dict에 두고, 조회 조건별로 id 목록을 정렬된 상태로 유지합니다.
+    id는 항상 증가하므로 인덱스 목록에는 append만 하면 정렬이 유지됩니다.
+    """
+
+    name = "memory"
+
+    def __init__(self, weeks=()):
+        self._lock = threading.RLock()
+        self._week_index = WeekIndex(list(weeks)) if weeks else None
+        self._rows: dict[int, tuple] = {}                                   # id -> ITEM_COLUMNS 튜플
+        self._next_id = 1
+        self._board_id = 1
+        self._by_board: dict[int, list[int]] = defaultdict(list)            # board -> ids
+        self._by_category: dict[tuple, list[int]] = defaultdict(list)       # (board, category) -> ids
+        self._by_keyword: dict[tuple, list[int]] = defaultdict(list)        # (board, keyword) -> ids
+        self._by_week: dict[int, list[int]] = defaultdict(list)             # week -> ids (모든 보드)
+        self._weeks: list[int] = []                                         # _by_week의 키 (정렬)
+        self._category_counts: Counter = Counter()                          # (board, category) -> 개수
+        self._keyword_counts: Counter = Counter()                           # (board, keyword) -> 개수
+
+    def insert_submission(self, keyword, category, grade, class_num, student_no, student_name, note, week, ts=None):
+        dt = datetime.fromisoformat(ts) if ts else datetime.now().astimezone()
+        ts = ts or dt.isoformat()
+        if week is None and self._week_index is not None:
+            week = self._week_index.week_for(ts)
+        with self._lock:
+            row_id = self._next_id
+            self._next_id += 1
+            board = self._board_id
+            self._rows[row_id] = (row_id, keyword, category, grade, class_num, student_no, student_name, note,
+                                  ts, week, int(dt.timestamp()), board)
+            self._by_board[board].append(row_id)
+            self._by_category[(board, category)].append(row_id)
+            self._by_keyword[(board, keyword)].append(row_id)
+            if week is not None:
+                if week not in self._by_week:
+                    insort(self._weeks, week)
+                self._by_week[week].append(row_id)
+            self._category_counts[(board, category)] += 1
+            self._keyword_counts[(board, keyword)] += 1
+        return row_id
+
+    def recent_submissions(self, limit=500, category=None):
+        with self._lock:
+            if _has_category(category):
+                ids = self._by_category.get((self._board_id, category), [])
+            else:
+                ids = self._by_board.get(self._board_id, [])
+            return [self._rows[i][:len(RECENT_COLUMNS)] for i in ids[-limit:]] if limit > 0 else []
+
+    def category_counts(self):
+        with self._lock:
+            return sorted((cat, n) for (board, cat), n in self._category_counts.items() if board == self._board_id)
+
+    def explanations_by_keyword(self, keyword, category=None, limit=200):
+        result = []
+        with self._lock:
+            for i in reversed(self._by_keyword.get((self._board_id, keyword), [])):
+                row = self._rows[i]
+                if _has_category(category) and row[2] != category:
+                    continue
+                result.append((row[6], row[4], row[5], row[7], row[8]))
+                if len(result) >= limit:
+                    break
+        return result
+
+    def distinct_keywords(self):
+        with self._lock:
+            return sorted(kw for (board, kw) in self._keyword_counts if board == self._board_id)
+
+    def filtered_items(self, class_nums=None, category=None, week_range=None, board_ids=None):
+        class_nums = set(class_nums) if class_nums else None
+        board_ids = set(board_ids) if board_ids else None
+        with self._lock:
+            if week_range is not None:
+                # 주차 범위에 해당하는 id 목록만 모아서 id 순서로 병합
+                lo, hi = bisect_left(self._weeks, week_range[0]), bisect_right(self._weeks, week_range[1])
+                ids = merge(*(self._by_week[w] for w in self._weeks[lo:hi]))
+            else:
+                ids = iter(self._rows)
+            rows = [self._rows[i] for i in ids]
+        return [
+            row for row in rows
+            if (class_nums is None or row[4] in class_nums)
+            and (not _has_category(category) or row[2] == category)
+            and (board_ids is None or row[11] in board_ids)
+        ]
+
+    def open_board(self, name=""):
+        with self._lock:
+            self._board_id += 1
+            return self._board_id
+
+
+BACKENDS = {"sqlite": SQLiteStorage, "memory": MemoryStorage}
+
+_storage: StorageBackend | None = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> StorageBackend:
+    """프로세스 전체에서 공유하는 저장소 (LIVEBOARD_STORAGE 환경 변수로 선택, 기본 sqlite)."""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                kind = os.environ.get("LIVEBOARD_STORAGE", "sqlite").lower()
+                if kind not in BACKENDS:
+                    raise ValueError(f"알 수 없는 저장소 종류: {kind} (가능: {', '.join(BACKENDS)})")
+                _storage = BACKENDS[kind]()
+    return _storage
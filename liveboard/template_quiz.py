@@ -0,0 +1,147 @@
+"""
+AI 없이 제출 데이터만으로 만드는 템플릿 퀴즈 (오프라인 대체 경로).
+
+google-genai가 없거나, API 키가 없거나, AI 호출 관문이 밀려 있을 때 랜덤 퀴즈 페이지가 쓰는
+기본 경로입니다. 키워드/카테고리/부연 설명(note)으로 객관식 문제를 만들고, 결과 형식은
+AI 퀴즈와 같습니다. ({"quiz_title", "questions": [{q_num, question, options, answer}]})
+DB 조회 한 번 + 메모리 계산이라 몇 ms 안에 끝납니다.
+
+문제 종류 (키워드마다 만들 수 있는 것 중 앞의 것부터):
+- 빈칸: 부연 설명에 키워드가 들어 있으면 그 자리를 비우고 키워드 고르기
+- 질문 → 키워드: 친구가 남긴 부연 설명을 보고 어떤 키워드에 대한 질문인지 고르기
+- 키워드 → 영역: 키워드가 어느 카테고리(어휘/문법/독해/기타)로 제출되었는지 고르기
+오답 보기는 같은 카테고리의 다른 키워드에서 먼저 고르고, 모자라면 다른 카테고리에서 채웁니다.
+
+같은 데이터와 문항 수면 항상 같은 퀴즈가 나옵니다. (키워드 집합 지문으로 난수 시드를 정함)
+"""
+import random
+import re
+
+from liveboard.queries import get_keyword_notes
+from liveboard.quiz_cache import keyword_fingerprint
+
+QUIZ_TITLE = "오늘의 질문 키워드 복습 퀴즈"
+CATEGORY_LABELS = {"Vocabulary": "어휘 (Vocabulary)", "Grammar": "문법 (Grammar)",
+                   "Reading": "독해 (Reading)", "Else": "기타 (Else)"}
+BLANK = "_____"
+
+_READING_KEYWORD = re.compile(r"^지문(\d+)번_문장(\d+)번$")
+
+
+def display_keyword(keyword: str) -> str:
+    """독해 키워드(지문{p}번_문장{s}번)는 읽기 쉬운 표기로."""
+    match = _READING_KEYWORD.match(keyword)
+    if match:
+        return f"지문 {match.group(1)}번 · 문장 {match.group(2)}번"
+    return keyword
+
+
+def _options(answer: str, distractors: list[str], rng: random.Random) -> tuple[list[str], int]:
+    choices = [answer, *distractors]
+    rng.shuffle(choices)
+    return [f"{i}. {c}" for i, c in enumerate(choices, start=1)], choices.index(answer) + 1
+
+
+def _distractors(keyword: str, category: str, by_category: dict, rng: random.Random) -> list[str] | None:
+    """같은 카테고리 키워드 우선으로 오답 3개. 키워드가 모자라면 None."""
+    same = [k for k in by_category.get(category, []) if k != keyword]
+    other = [k for c, ks in sorted(by_category.items()) if c != category for k in ks]
+    rng.shuffle(same)
+    rng.shuffle(other)
+    picked = (same + other)[:3]
+    return picked if len(picked) == 3 else None
+
+
+def _cloze(keyword, category, notes, by_category, rng):
+    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+    for note in notes:
+        if pattern.search(note):
+            distractors = _distractors(keyword, category, by_category, rng)
+            if distractors is None:
+                return None
+            options, answer = _options(keyword, distractors, rng)
+            return {"question": f"빈칸에 들어갈 키워드를 고르세요.\n\n“{pattern.sub(BLANK, note)}”",
+                    "options": options, "answer": answer}
+    return None
+
+
+def _note_to_keyword(keyword, category, notes, by_category, keywords_by_note, rng):
+    # 다른 키워드에도 똑같이 남긴 설명("발음을 모르겠어요" 등)은 답이 하나로 정해지지 않으므로 제외
+    unique = [n for n in notes if keywords_by_note[n] == {keyword}]
+    if not unique:
+        return None
+    note = rng.choice(unique)
+    distractors = _distractors(keyword, category, by_category, rng)
+    if distractors is None:
+        return None
+    options, answer = _options(display_keyword(keyword), [display_keyword(k) for k in distractors], rng)
+    return {"question": f"친구가 “{note}”라고 질문한 키워드는 무엇일까요?", "options": options, "answer": answer}
+
+
+def _keyword_to_category(keyword, category, rng):
+    if category not in CATEGORY_LABELS:
+        return None
+    others = [label for c, label in CATEGORY_LABELS.items() if c != category]
+    options, answer = _options(CATEGORY_LABELS[category], others, rng)
+    return {"question": f"‘{display_keyword(keyword)}’는 어느 영역의 질문 키워드로 제출되었을까요?",
+            "options": options, "answer": answer}
+
+
+def build_template_quiz(rows, num_questions: int, seed=None) -> dict | None:
+    """
+    rows: [(keyword, category, note, ...), ...] (db.get_keyword_notes 형식)
+    키워드마다 한 문제씩 돌아가며 num_questions개를 만듭니다. 만들 수 있는 문제가 없으면 None.
+    """
+    rows = [(str(r[0]), str(r[1]), str(r[2] or "").strip()) for r in rows if r[0]]
+    if not rows or num_questions <= 0:
+        return None
+
+    # 여러 카테고리로 제출된 키워드는 가장 많이 쓰인(같으면 이름순 첫) 카테고리로 봄
+    category_votes: dict[str, dict[str, int]] = {}
+    notes: dict[str, list[str]] = {}
+    keywords_by_note: dict[str, set] = {}
+    for keyword, category, note in rows:
+        votes = category_votes.setdefault(keyword, {})
+        votes[category] = votes.get(category, 0) + 1
+        if note:
+            notes.setdefault(keyword, [])
+            if note not in notes[keyword]:
+                notes[keyword].append(note)
+            keywords_by_note.setdefault(note, set()).add(keyword)
+    category_of = {k: sorted(v.items(), key=lambda kv: (-kv[1], kv[0]))[0][0] for k, v in category_votes.items()}
+    by_category: dict[str, list[str]] = {}
+    for keyword in sorted(category_of):
+        by_category.setdefault(category_of[keyword], []).append(keyword)
+
+    rng = random.Random(f"{keyword_fingerprint(category_of)}:{num_questions}" if seed is None else seed)
+
+    # 키워드마다 만들 수 있는 문제 후보 (앞의 종류부터)
+    candidates: dict[str, list[dict]] = {}
+    for keyword in sorted(category_of):
+        category = category_of[keyword]
+        kw_notes = notes.get(keyword, [])
+        items = [
+            _cloze(keyword, category, kw_notes, by_category, rng),
+            _note_to_keyword(keyword, category, kw_notes, by_category, keywords_by_note, rng),
+            _keyword_to_category(keyword, category, rng),
+        ]
+        items = [item for item in items if item is not None]
+        if items:
+            candidates[keyword] = items
+    if not candidates:
+        return None
+
+    # sample_quiz와 같이 키워드를 섞어서 돌아가며 한 문제씩
+    order = list(candidates)
+    rng.shuffle(order)
+    questions = []
+    while len(questions) < num_questions and any(candidates[k] for k in order):
+        for keyword in order:
+            if candidates[keyword] and len(questions) < num_questions:
+                questions.append({"q_num": len(questions) + 1, **candidates[keyword].pop(0)})
+    return {"quiz_title": QUIZ_TITLE, "questions": questions}
+
+
+def template_quiz(num_questions: int, board_id: int | None = None, seed=None) -> dict | None:
+    """현재 보드(또는 board_id)의 제출 데이터로 템플릿 퀴즈를 만듭니다."""
+    return build_template_quiz(get_keyword_notes(board_id), num_questions, seed=seed)
@@ -0,0 +1,96 @@
+"""
+현재 수업 시간의 분당 제출 추이 (카테고리별).
+
+최근 WINDOW_MINUTES분의 분 단위 카운트를 고정 크기 링 버퍼에 메모리로 유지합니다.
+처음 한 번만 ts_epoch 인덱스로 구간 집계를 읽어 채우고(seed), 이후에는 데이터 세대가
+바뀔 때 새로 들어온 행만 더합니다. 버퍼 크기가 고정이라 서버를 오래 켜 두어도
+메모리 사용량은 늘지 않습니다. (프로세스 전체에서 하나를 공유)
+현재 보드의 제출만 세며, 새 보드가 열리면 그 보드 기준으로 다시 채웁니다.
+"""
+import threading
+import time
+from collections import Counter
+
+from liveboard.db import get_bucket_snapshot, get_submissions_since
+
+WINDOW_MINUTES = 15
+
+
+class RateTimeline:
+    def __init__(self, window_minutes: int = WINDOW_MINUTES):
+        self.window = window_minutes
+        # 슬롯 i에는 (minute % window == i)인 분의 (분 번호, 카테고리별 카운트)가 들어감
+        self._slots: list[tuple[int, Counter]] = [(-1, Counter()) for _ in range(window_minutes)]
+        self._lock = threading.Lock()
+        self.last_id = None
+        self.total = 0
+        self.generation = None
+        self.board_id = None
+
+    def _add(self, minute: int, category: str, count: int = 1):
+        i = minute % self.window
+        slot_minute, counts = self._slots[i]
+        if slot_minute != minute:
+            if slot_minute > minute:
+                # 이미 더 최근 분이 차지한 슬롯: 창 밖의 오래된 행이므로 무시
+                return
+            counts = Counter()
+            self._slots[i] = (minute, counts)
+        counts[category] += count
+
+    def _seed(self, now: float):
+        self._slots = [(-1, Counter()) for _ in range(self.window)]
+        now_minute = int(now // 60)
+        t0 = (now_minute - self.window + 1) * 60
+        buckets, self.last_id, self.total = get_bucket_snapshot(
+            t0, (now_minute + 1) * 60, bucket_minutes=1, board_id=self.board_id
+        )
+        for bucket, category, count in buckets:
+            self._add(bucket // 60, category, count)
+
+    def sync(self, generation: int, board_id: int | None = None, now: float | None = None):
+        """데이터 세대가 바뀐 경우에만 새 행을 반영합니다. (보드 변경/삭제가 감지되면 다시 seed)"""
+        with self._lock:
+            if generation == self.generation and board_id == self.board_id:
+                return
+            self.generation = generation
+            now = time.time() if now is None else now
+            if self.last_id is None or board_id != self.board_id:
+                self.board_id = board_id
+                self._seed(now)
+                return
+            rows, total = get_submissions_since(self.last_id, board_id=self.board_id)
+            if total != self.total + len(rows):
+                self._seed(now)
+                return
+            for _id, category, ts_epoch in rows:
+                if ts_epoch is not None:
+                    self._add(ts_epoch // 60, category)
+            if rows:
+                self.last_id = rows[-1][0]
+            self.total = total
+
+    def series(self, categories, now: float | None = None) -> list[tuple[int, str, int]]:
+        """최근 window분의 [(분 시작 epoch, category, count), ...] — 빈 분은 0으로 채움."""
+        now_minute = int((time.time() if now is None else now) // 60)
+        result = []
+        with self._lock:
+            for minute in range(now_minute - self.window + 1, now_minute + 1):
+                slot_minute, counts = self._slots[minute % self.window]
+                for category in categories:
+                    count = counts.get(category, 0) if slot_minute == minute else 0
+                    result.append((minute * 60, category, count))
+        return result
+
+
+_timeline: RateTimeline | None = None
+_timeline_lock = threading.Lock()
+
+
+def get_timeline() -> RateTimeline:
+    global _timeline
+    if _timeline is None:
+        with _timeline_lock:
+            if _timeline is None:
+                _timeline = RateTimeline()
+    return _timeline
@@ -0,0 +1,184 @@
+"""
+워드클라우드 렌더링 + 결과 이미지 캐시.
+
+WordCloud 배치 계산은 한글 폰트 기준 수백 ms가 걸리고 어휘 수에 따라 늘어납니다.
+같은 빈도표/폰트/옵션이면 결과 이미지도 같으므로, 그 조합의 해시를 키로
+압축된 PNG 바이트를 프로세스 전체에서 공유하는 크기 제한 캐시에 저장합니다.
+(키워드 버튼 클릭처럼 빈도가 그대로인 rerun은 캐시에서 바로 표시)
+
+캐시에 없는 새 이미지는 작은 프로세스 풀에서 그립니다. 배치 계산은 CPU 위주의
+Python/NumPy 코드라 스크립트 스레드에서 돌리면 다른 세션과 GIL을 다투기 때문입니다.
+정해진 시간 안에 끝나지 않으면 같은 자리의 이전 이미지를 보여주고,
+완성된 이미지는 캐시에 들어가서 다음 rerun에 표시됩니다.
+"""
+import atexit
+import hashlib
+import io
+import json
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# 워드클라우드 라이브러리 시도 임포트
+try:
+    from wordcloud import WordCloud
+    WORDCLOUD_AVAILABLE = True
+except Exception:
+    WORDCLOUD_AVAILABLE = False
+
+# 기본 직사각형 워드클라우드 옵션
+DEFAULT_PARAMS = {
+    "width": 700,
+    "height": 420,
+    "background_color": "white",
+    "colormap": "plasma",
+    "prefer_horizontal": 0.9,
+    "contour_width": 0,
+    "random_state": 42,
+}
+
+MAX_ENTRIES = 64
+MAX_BYTES = 32 * 1024 * 1024
+
+RENDER_WORKERS = 2
+RENDER_TIMEOUT = 0.3   # 스크립트 스레드가 새 이미지를 기다리는 최대 시간 (초)
+
+
+class ImageCache:
+    """이미지 바이트용 LRU (항목 수 + 전체 바이트 수 제한)."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                return
+            self._data[key] = value
+            self._bytes += len(value)
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _key, old = self._data.popitem(last=False)
+                self._bytes -= len(old)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._data), "bytes": self._bytes}
+
+
+image_cache = ImageCache()
+
+
+def wordcloud_key(freq: dict, font_path: str | None, params: dict) -> str:
+    """빈도표 + 폰트 + 렌더 옵션의 지문(fingerprint). 키워드 순서와 무관합니다."""
+    payload = json.dumps(
+        {"freq": sorted(freq.items()), "font": font_path, "params": sorted(params.items())},
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _render_png(freq: dict, font_path: str | None, params: dict) -> bytes:
+    wc = WordCloud(font_path=font_path, **params).generate_from_frequencies(freq)
+    buf = io.BytesIO()
+    wc.to_image().save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_pending: dict[str, Future] = {}         # 렌더링 중인 키 -> Future (같은 이미지는 한 번만 그림)
+_last_image: dict[str, bytes] = {}       # 자리(slot)별 마지막으로 완성된 이미지
+_state_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn: 스레드가 많은 서버 프로세스를 fork하지 않도록
+                _executor = ProcessPoolExecutor(
+                    max_workers=RENDER_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+    return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        broken, _executor = _executor, None
+    if broken is not None:
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(key: str, freq: dict, font_path: str | None, params: dict) -> Future:
+    with _state_lock:
+        fut = _pending.get(key)
+        if fut is not None:
+            return fut
+        fut = _get_executor().submit(_render_png, freq, font_path, params)
+        _pending[key] = fut
+
+    def _done(f: Future):
+        with _state_lock:
+            _pending.pop(key, None)
+        if not f.cancelled() and f.exception() is None:
+            image_cache.put(key, f.result())
+
+    fut.add_done_callback(_done)
+    return fut
+
+
+def render_wordcloud(freq: dict, font_path: str | None = None, slot: str = "default",
+                     timeout: float = RENDER_TIMEOUT, **overrides) -> tuple[bytes | None, bool]:
+    """
+    빈도표로 워드클라우드 PNG 바이트를 만듭니다.
+    반환: (이미지, 최신 여부)
+      - 캐시에 있거나 timeout 안에 완성되면 (새 이미지, True)
+      - 시간이 부족하면 (같은 slot의 이전 이미지 또는 None, False) — 렌더링은 뒤에서 계속됨
+    """
+    params = {**DEFAULT_PARAMS, **overrides}
+    key = wordcloud_key(freq, font_path, params)
+    png = image_cache.get(key)
+    if png is None:
+        try:
+            png = _submit(key, freq, font_path, params).result(timeout=timeout)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # 작업 프로세스가 죽은 경우 다음 호출에서 풀을 새로 만듦
+                _reset_executor()
+            # 시간 초과 또는 렌더링 실패: 이전 이미지로 대신 표시
+            with _state_lock:
+                return _last_image.get(slot), False
+        image_cache.put(key, png)
+    with _state_lock:
+        _last_image[slot] = png
+    return png, True
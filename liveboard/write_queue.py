@@ -0,0 +1,101 @@
+"""
+학생 제출용 그룹 커밋 쓰기 큐.
+
+수업 끝무렵 여러 세션이 동시에 "제출하기"를 누르면 세션마다 따로 INSERT/커밋을 하면서
+WAL 쓰기 잠금을 두고 경쟁하게 됩니다. 대신 모든 세션의 INSERT를 큐에 넣고,
+백그라운드 스레드 하나가 N건 또는 M밀리초마다 한 트랜잭션으로 모아서 커밋합니다.
+각 세션은 Future를 받아서 실제로 커밋된 뒤에만 성공 메시지를 표시합니다.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+MAX_BATCH = 64        # 한 번에 커밋할 최대 행 수
+MAX_DELAY_MS = 50     # 첫 행이 들어온 뒤 커밋까지 기다리는 최대 시간
+
+_STOP = object()
+
+
+class WriteQueue:
+    def __init__(self, pool, max_batch: int = MAX_BATCH, max_delay_ms: int = MAX_DELAY_MS):
+        self.pool = pool
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay_ms / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="liveboard-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, sql: str, params: tuple) -> Future:
+        """
+        INSERT/UPDATE 한 건을 큐에 넣고 Future를 반환합니다.
+        Future의 결과는 커밋된 행의 lastrowid입니다.
+        """
+        fut: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("쓰기 큐가 이미 종료되었습니다.")
+            self._queue.put((sql, params, fut))
+        return fut
+
+    def _collect(self, first) -> tuple[list, bool]:
+        batch = [first]
+        stop = False
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _run(self):
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stop = self._collect(first)
+            self._flush(batch)
+        # 종료 요청 이후에 남은 항목도 모두 커밋 (drain)
+        rest = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                rest.append(item)
+        for i in range(0, len(rest), self.max_batch):
+            self._flush(rest[i:i + self.max_batch])
+
+    def _flush(self, batch: list):
+        results = []
+        try:
+            with self.pool.writer() as conn:
+                for sql, params, _fut in batch:
+                    results.append(conn.execute(sql, params).lastrowid)
+        except Exception as e:
+            # 트랜잭션 전체가 롤백되었으므로 배치의 모든 요청에 실패를 알림
+            for _sql, _params, fut in batch:
+                fut.set_exception(e)
+            return
+        for (_sql, _params, fut), rowid in zip(batch, results):
+            fut.set_result(rowid)
+
+    def close(self, timeout: float | None = 10):
+        """새 요청을 막고, 대기 중인 행을 모두 커밋한 뒤 스레드를 종료합니다."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
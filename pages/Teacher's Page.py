@@ -1,70 +1,16 @@
 import streamlit as st
-import sqlite3
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date
 import pandas as pd
 import altair as alt
 
 st.set_page_config(page_title="제출 데이터 탐색", layout="wide")
 
-# DB 경로 (프로젝트 루트의 keywords.db 사용)
-DB_PATH = Path(__file__).parents[1] / "keywords.db"
-
-def get_all_items(limit: int = 5000):
-    """
-    DB에서 항목을 불러옵니다.
-    최신 스키마(week 컬럼 포함)인 경우와 구버전(week 없음)을 모두 처리해서
-    (rows, has_week) 형태로 반환합니다.
-    """
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            SELECT id, keyword, category, grade, class_num, student_no, student_name, note, ts, week
-            FROM keywords
-            ORDER BY id DESC
-            LIMIT ?
-            """,
-            (limit,),
-        )
-        rows = cur.fetchall()
-        conn.close()
-        return list(reversed(rows)), True
-    except sqlite3.OperationalError:
-        cur.execute(
-            """
-            SELECT id, keyword, category, grade, class_num, student_no, student_name, note, ts
-            FROM keywords
-            ORDER BY id DESC
-            LIMIT ?
-            """,
-            (limit,),
-        )
-        rows = cur.fetchall()
-        conn.close()
-        return list(reversed(rows)), False
-
-def compute_week_from_dates(df):
-    """ts를 기준으로 학기 시작을 가장 이른 제출일의 주 월요일로 잡아 1~17주로 계산."""
-    if df.empty:
-        return df
-    df["dt"] = pd.to_datetime(df["ts"], errors="coerce")
-    min_dt = df["dt"].min()
-    if pd.isna(min_dt):
-        term_start = None
-    else:
-        term_start = (min_dt - timedelta(days=min_dt.weekday())).date()
-    def _wk(dt):
-        if pd.isna(dt) or term_start is None:
-            return None
-        days = (dt.date() - term_start).days
-        w = (days // 7) + 1
-        if w < 1: return 1
-        if w > 17: return 17
-        return int(w)
-    df["week"] = df["dt"].apply(_wk)
-    return df
+# DB 접근은 공용 모듈에서 (공유 연결 풀 + 세션 간 공유 결과 캐시)
+from liveboard.academic_calendar import parse_holidays
+from liveboard.archive import archive_summary, archive_weeks
+from liveboard.db import ITEM_COLUMNS, current_week, get_calendar, get_maintenance, save_calendar, write_stats
+from liveboard.queries import get_filtered_items, get_top_keywords_by_week, get_week_range, get_total_count, list_boards, cache_stats
 
 st.title("제출 데이터 탐색")
 
@@ -75,46 +21,15 @@ main_week_select  = ss.get("week_select", None)        # 예: 3 (int)
 main_category_select = ss.get("category_select", None) # 예: "Reading"
 main_view_category   = ss.get("view_category", None)   # 예: "All"
 
-# 데이터 로드
-items, has_week = get_all_items()
-rows = []
-for r in items:
-    if has_week:
-        rows.append({
-            "id": r[0],
-            "keyword": r[1],
-            "category": r[2],
-            "grade": r[3],
-            "class_num": r[4],
-            "student_no": r[5],
-            "student_name": r[6],
-            "note": r[7],
-            "ts": r[8],
-            "week": r[9],
-        })
-    else:
-        rows.append({
-            "id": r[0],
-            "keyword": r[1],
-            "category": r[2],
-            "grade": r[3],
-            "class_num": r[4],
-            "student_no": r[5],
-            "student_name": r[6],
-            "note": r[7],
-            "ts": r[8],
-        })
-df_all = pd.DataFrame(rows)
-
-if df_all.empty:
+# 전체 건수는 집계 테이블에서 확인 (원본 행은 필터 조건이 정해진 뒤에 필요한 만큼만 읽음)
+if get_total_count() == 0:
     st.info("제출된 항목이 없습니다. 메인 페이지에서 키워드를 먼저 제출하세요.")
     st.stop()
 
-# week 컬럼이 없으면 재계산, 있으면 정수형으로 정리
-if "week" not in df_all.columns:
-    df_all = compute_week_from_dates(df_all)
-else:
-    df_all["week"] = pd.to_numeric(df_all["week"], errors="coerce").astype("Int64")
+# 보드(수업) 필터 — 기본은 모든 보드, 새 보드를 열어도 이전 보드 제출을 여기서 볼 수 있음
+boards = list_boards()
+board_labels = {b[0]: f"{b[1] or f'보드 #{b[0]}'} ({str(b[2])[:10]}, {b[3]}건)" for b in boards}
+board_sel = st.multiselect("보드 필터 (비우면 전체)", list(board_labels), format_func=board_labels.get)
 
 # 반 필터 (항상 1~12) — 메인 페이지 선택을 기본값으로 반영
 class_options = list(range(1,13))
@@ -138,9 +53,9 @@ view_cat = st.selectbox("카테고리 필터", category_options, index=category_
 
 # 주차 슬라이더 (1~17) — 메인 페이지에서 선택한 주차를 기본으로 반영
 min_week, max_week = 1, 17
-data_weeks = df_all["week"].dropna().astype(int) if "week" in df_all.columns else pd.Series(dtype=int)
-data_min = int(data_weeks.min()) if not data_weeks.empty else min_week
-data_max = int(data_weeks.max()) if not data_weeks.empty else max_week
+week_lo, week_hi = get_week_range()
+data_min = int(week_lo) if week_lo is not None else min_week
+data_max = int(week_hi) if week_hi is not None else max_week
 
 # 메인 페이지에서 저장한 week_select 가져오기(있으면 정수로 변환)
 main_week_select = st.session_state.get("week_select", None)
@@ -167,13 +82,11 @@ if main_week_int is not None:
 
 # ...existing code continues (필터 적용 등) ...
 
-# 필터 적용
-df_filtered = df_all.copy()
-if class_sel:
-    df_filtered = df_filtered[df_filtered["class_num"].isin(class_sel)]
-if view_cat and view_cat != "All":
-    df_filtered = df_filtered[df_filtered["category"] == view_cat]
-df_filtered = df_filtered[df_filtered["week"].between(week_range[0], week_range[1])]
+# 필터 적용 (SQL WHERE 절로 조회 — 조건에 맞는 행만 인덱스로 읽음)
+items = get_filtered_items(class_nums=class_sel, category=view_cat, week_range=tuple(week_range), board_ids=board_sel)
+df_filtered = pd.DataFrame.from_records(items, columns=ITEM_COLUMNS).astype(
+    {"class_num": "Int64", "student_no": "Int64", "week": "Int64"}
+)
 
 st.markdown(f"필터 적용: 반 = {', '.join([f'{c}반' for c in class_sel])} / 카테고리 = {view_cat} / 주차 = {week_range[0]} ~ {week_range[1]}")
 st.write(f"결과 항목: {len(df_filtered)}개")
@@ -181,31 +94,29 @@ st.write(f"결과 항목: {len(df_filtered)}개")
 if df_filtered.empty:
     st.info("필터 조건에 맞는 항목이 없습니다.")
 else:
-    # 카테고리×주차 표: 각 칸에 최다 빈도 키워드 표시
+    # 카테고리×주차 표: 각 칸에 최다 빈도 키워드 표시 (동점이면 모두 표시)
     categories = ["Vocabulary", "Grammar", "Reading", "Else"]
     weeks = list(range(week_range[0], week_range[1] + 1))
-
-    top_map = {}
-    for w in weeks:
-        row_vals = {}
-        for c in categories:
-            sub = df_filtered[(df_filtered["week"] == w) & (df_filtered["category"] == c)]
-            if not sub.empty:
-                kw_counts = sub.groupby("keyword").size().reset_index(name="count").sort_values("count", ascending=False)
-                top = kw_counts.iloc[0]
-                row_vals[c] = f"{top['keyword']} ({int(top['count'])})"
-            else:
-                row_vals[c] = ""
-        top_map[w] = row_vals
-
-    table_df = pd.DataFrame.from_dict(top_map, orient="index")[categories]
+    top_k = st.number_input("칸별 표시 순위 (동점 포함)", min_value=1, max_value=5, value=1, step=1)
+
+    # 집계 테이블에서 한 번의 쿼리로 (주차, 카테고리)별 순위 계산 — 필터 상태별로 공유 캐시
+    top_rows = get_top_keywords_by_week(class_nums=class_sel, category=view_cat, week_range=tuple(week_range), top_k=int(top_k), board_ids=board_sel)
+    df_top = pd.DataFrame.from_records(top_rows, columns=["week", "category", "keyword", "count", "rank"])
+    df_top["cell"] = df_top["keyword"] + " (" + df_top["count"].astype(str) + ")"
+    table_df = (
+        df_top.groupby(["week", "category"])["cell"].agg(", ".join)
+        .unstack("category")
+        .reindex(index=weeks, columns=categories)
+        .fillna("")
+    )
     table_df.index.name = "주차"
     st.dataframe(table_df, use_container_width=True)
 
     # 선택한 주차 범위에 속하는 원본 제출 항목 모두 표시
 st.markdown("#### 선택한 주차에 제출된 원본 항목 (모두 보기)")
 raw_cols = ["ts", "category", "keyword", "note", "grade", "class_num", "student_no", "student_name"]
-df_display = df_filtered.copy()
+# 제출시간 정렬은 문자열이 아닌 정수 epoch 기준 (시간대가 섞여 있어도 올바른 순서)
+df_display = df_filtered.sort_values(["ts_epoch", "id"], ascending=False)
 if not df_display.empty:
     df_display = df_display[raw_cols].rename(columns={
         "ts": "제출시간",
@@ -216,7 +127,7 @@ if not df_display.empty:
         "class_num": "반",
         "student_no": "번호",
         "student_name": "이름"
-    }).sort_values("제출시간", ascending=False).reset_index(drop=True)
+    }).reset_index(drop=True)
 
     # 인덱스를 1부터 시작하고, 인덱스 이름을 'No'로
     df_display.index = range(1, len(df_display) + 1)
@@ -227,3 +138,79 @@ if not df_display.empty:
     st.dataframe(df_display[cols_order], use_container_width=True)
 else:
     st.info("필터된 항목이 없습니다.")
+
+# 학사 일정: 제출 날짜 → 주차 계산 기준 (저장 시 주차가 비어 있는 과거 행도 한 번에 채움)
+with st.expander("📅 학사 일정 (주차 계산 기준)", expanded=False):
+    saved_weeks, saved_holidays = get_calendar()
+    default_start = date.fromisoformat(saved_weeks[0][1]) if saved_weeks else date.today()
+    term_start = st.date_input("학기 시작일", value=default_start, key="calendar_term_start")
+    holiday_text = st.text_area(
+        "휴일 (한 줄에 하나, 기간은 ~ 로 표시)",
+        value="\n".join(saved_holidays),
+        placeholder="2025-10-09\n2025-09-29 ~ 2025-10-03",
+        key="calendar_holidays",
+    )
+    if st.button("학사 일정 저장", key="calendar_save"):
+        try:
+            filled = save_calendar(term_start, parse_holidays(holiday_text))
+            st.success(f"✅ 학사 일정을 저장했습니다. 주차가 비어 있던 {filled}개 항목을 채웠습니다.")
+        except ValueError as e:
+            st.error(f"날짜 형식을 확인해주세요: {e}")
+    if saved_weeks:
+        df_weeks = pd.DataFrame(saved_weeks, columns=["주차", "시작일", "종료일"]).set_index("주차")
+        st.dataframe(df_weeks, use_container_width=True)
+
+# 끝난 주차 보관: 원본 행과 주차별 집계를 보관 DB로 옮김 (위 표/필터는 보관 데이터도 함께 조회)
+with st.expander("🗄️ 지난 주차 보관", expanded=False):
+    summary = archive_summary()
+    a1, a2, a3 = st.columns(3)
+    a1.metric("현재 데이터", f"{summary['live_rows']}건")
+    a2.metric("보관 데이터", f"{summary['archived_rows']}건")
+    a3.metric("보관된 주차", ", ".join(map(str, summary["archived_weeks"])) or "-")
+    before_week = st.number_input(
+        "이 주차 이전까지 보관 (현재 보드는 제외)", min_value=2, max_value=18,
+        value=max(2, current_week() or 2), step=1, key="archive_before_week",
+    )
+    if st.button("지난 주차 보관하기", key="archive_run"):
+        moved = archive_weeks(int(before_week))
+        if moved:
+            st.success(f"✅ {', '.join(f'{w}주차' for w in moved)}의 {sum(moved.values())}개 항목을 보관했습니다.")
+        else:
+            st.info("보관할 항목이 없습니다.")
+
+# WAL 체크포인트/유지보수 상태 (백그라운드 스레드가 주기적으로 실행)
+with st.expander("🛠️ DB 유지보수 상태", expanded=False):
+    maintenance = get_maintenance()
+    if st.button("지금 체크포인트 + 빈 공간 정리", key="maintenance_run"):
+        maintenance.checkpoint("RESTART")
+        maintenance.vacuum()
+    mstats = maintenance.stats()
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("WAL 크기", f"{mstats['wal_bytes']['main'] / 1024:.0f} KB")
+    m2.metric("마지막 체크포인트", f"{mstats['last_checkpoint_ms']} ms" if mstats["last_checkpoint_ms"] is not None else "-")
+    m3.metric("반환한 페이지", mstats["pages_reclaimed"])
+    m4.metric("optimize 실행", mstats["optimize_runs"])
+    st.caption(
+        f"체크포인트 {mstats['checkpoints']}회 (마지막: {mstats['last_checkpoint_mode'] or '-'}, "
+        f"{mstats['last_checkpoint_frames'] or 0}프레임) · 보관 DB WAL {mstats['wal_bytes']['archive'] / 1024:.0f} KB · "
+        f"마지막 쓰기 후 {mstats['idle_seconds']}초"
+        + (f" · 오류 {mstats['errors']}회: {mstats['last_error']}" if mstats["errors"] else "")
+    )
+    # 이 서버 프로세스의 쓰기 잠금 경합 (재시도/실패가 늘면 DB 파일 하나로는 부하를 감당하지 못하는 것)
+    wstats = write_stats()
+    w1, w2, w3, w4 = st.columns(4)
+    w1.metric("쓰기 트랜잭션", wstats["transactions"])
+    w2.metric("잠금 재시도", wstats["retries"])
+    w3.metric("잠금 실패", wstats["failures"])
+    w4.metric("평균 잠금 대기", f"{wstats['avg_lock_wait_ms']} ms")
+    st.caption(f"누적 잠금 대기 {wstats['lock_wait_seconds']}초 · 최대 {wstats['max_lock_wait_ms']} ms")
+
+# 공유 캐시 상태 (캐시 크기 조정용)
+with st.expander("⚙️ 조회 캐시 상태", expanded=False):
+    stats = cache_stats()
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("적중", stats["hits"])
+    c2.metric("미스", stats["misses"])
+    c3.metric("적중률", f"{stats['hit_rate'] * 100:.1f}%")
+    c4.metric("항목 / 행", f"{stats['entries']} / {stats['rows']}")
+    st.caption(f"데이터 세대: {stats['generation']} · 제거된 항목: {stats['evictions']}")
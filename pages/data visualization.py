@@ -1,8 +1,5 @@
 import streamlit as st
-import sqlite3
-from datetime import datetime
 from pathlib import Path
-from collections import Counter
 
 import pandas as pd
 import altair as alt
@@ -111,57 +108,15 @@ else:
     FONT_PATH = None
 # --- end font setup ---
 
-# 워드클라우드 라이브러리 시도 임포트
-try:
-    from wordcloud import WordCloud
-    WORDCLOUD_AVAILABLE = True
-except Exception:
-    WORDCLOUD_AVAILABLE = False
-
-# DB 경로 설정 (pages/live_board.py 기준)
-DB_PATH = Path(__file__).parent.parent / "keywords.db"
-
-def init_db():
-    # 이 페이지에서는 데이터를 입력하지 않으므로, 테이블 생성/컬럼 추가 로직은 생략하거나 그대로 두어도 됩니다.
-    # 안전하게 그대로 유지하는 것이 좋습니다.
-    conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL;")
-    
-    # 이 페이지에서는 SELECT만 사용하므로, 테이블 생성/컬럼 추가 로직은 삭제해도 되지만
-    # 안정성을 위해 최소한의 구조는 유지하는 것이 좋습니다.
-    # 여기서는 SELECT에 필요한 함수만 남기고, 테이블 생성 로직은 생략합니다.
-    return conn
-
-conn = init_db()
-
-# 데이터 조회 함수 (기존 코드와 동일)
-def get_keywords(limit: int = 500, category: str | None = None):
-    cur = conn.cursor()
-    if category and category != "All":
-        cur.execute("SELECT id, keyword, category, grade, class_num, student_no, student_name, note, ts FROM keywords WHERE category = ? ORDER BY id DESC LIMIT ?", (category, limit))
-    else:
-        cur.execute("SELECT id, keyword, category, grade, class_num, student_no, student_name, note, ts FROM keywords ORDER BY id DESC LIMIT ?", (limit,))
-    rows = cur.fetchall()
-    return list(reversed(rows))
-
-# 키워드로 부연설명 조회 함수 (기존 코드와 동일)
-def get_explanations_by_keyword(keyword: str, category: str | None = None, limit: int = 200):
-    cur = conn.cursor()
-    if category and category != "All":
-        cur.execute("""SELECT student_name, class_num, student_no, note, ts
-                       FROM keywords WHERE keyword = ? AND category = ? ORDER BY id DESC LIMIT ?""",
-                    (keyword, category, limit))
-    else:
-        cur.execute("""SELECT student_name, class_num, student_no, note, ts
-                       FROM keywords WHERE keyword = ? ORDER BY id DESC LIMIT ?""",
-                    (keyword, limit))
-    return cur.fetchall()
+# 워드클라우드 렌더링 (라이브러리 유무 확인 + 결과 이미지 캐시)
+from liveboard.wordcloud_render import WORDCLOUD_AVAILABLE, render_wordcloud
 
-def get_category_counts():
-    cur = conn.cursor()
-    cur.execute("SELECT category, COUNT(*) FROM keywords GROUP BY category")
-    rows = cur.fetchall()
-    return rows
+# DB 접근은 공용 모듈에서 (모든 페이지가 하나의 연결 풀을 공유)
+from liveboard.db import open_board
+from liveboard.queries import get_active_board, get_explanations_by_keyword, get_category_counts, clear_cache
+from liveboard.live_feed import LiveFeed
+from liveboard.notify import current_generation
+from liveboard.timeline import get_timeline
 
 # ------------------------------------
 # 📌 2. 페이지 레이아웃 및 시각화 코드
@@ -172,57 +127,105 @@ st.set_page_config(page_title="Exit Ticket Live Board", layout="centered")
 st.markdown("<h1 style='text-align:center; margin-bottom:0.25rem;'>📊 실시간 질문 분석 보드 📊</h1>", unsafe_allow_html=True)
 st.markdown("---")
 
-# 보기용 카테고리 선택 전에 전체 카테고리별 제출 수를 파이 차트로 표시
-counts = get_category_counts()
-if counts:
-    df_counts = pd.DataFrame(counts, columns=["category", "count"])
-    # 백분율 칼럼 추가 (툴팁에 사용)
-    df_counts["percent"] = (df_counts["count"] / df_counts["count"].sum() * 100).round(1)
+# 실시간 갱신 주기 (초) — 각 탭은 이 주기마다 메모리의 데이터 세대 번호만 확인하고,
+# 새 제출이 있어 번호가 바뀐 경우에만 DB를 다시 읽습니다.
+LIVE_REFRESH_SECONDS = 2
+
+
+def active_board_id():
+    # 현재 보드 id (새 보드가 열리면 세대 번호가 바뀌므로 공유 캐시로 충분)
+    board = get_active_board()
+    return board[0] if board else None
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def category_overview():
+    # 보기용 카테고리 선택 전에 전체 카테고리별 제출 수를 파이 차트로 표시
+    # 세대 번호가 바뀐 경우에만 집계를 다시 읽음 (공유 캐시: 모든 탭이 같은 결과 사용)
+    counts = get_category_counts(board_id=active_board_id())
+    if counts:
+        df_counts = pd.DataFrame(counts, columns=["category", "count"])
+        # 백분율 칼럼 추가 (툴팁에 사용)
+        df_counts["percent"] = (df_counts["count"] / df_counts["count"].sum() * 100).round(1)
+
+        # 통합 제목 (파이 + 바 한 번에)
+        st.markdown("### 📊 카테고리별 질문 현황")
+        col1, col2 = st.columns([1,1])
+
+        # 일관된 색상 스케일 사용
+        color_scale = alt.Scale(domain=df_counts["category"].tolist(), scheme="category10")
+
+        with col1:
+            pie = (
+                alt.Chart(df_counts)
+                .mark_arc(innerRadius=60)
+                .encode(
+                    theta=alt.Theta("count:Q"),
+                    color=alt.Color("category:N", scale=color_scale, legend=alt.Legend(title="카테고리")),
+                    tooltip=[alt.Tooltip("category:N", title="카테고리"),
+                             alt.Tooltip("count:Q", title="건수"),
+                             alt.Tooltip("percent:Q", title="비율(%)")]
+                )
+                .properties(height=360)
+            )
+            st.altair_chart(pie, use_container_width=True)
+
+        with col2:
+            bar = (
+                alt.Chart(df_counts)
+                .mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
+                .encode(
+                    x=alt.X("category:N", sort="-y", title=None),
+                    y=alt.Y("count:Q", title="제출 수"),
+                    color=alt.Color("category:N", scale=color_scale, legend=None),
+                    tooltip=[alt.Tooltip("category:N", title="카테고리"),
+                             alt.Tooltip("count:Q", title="건수")]
+                )
+                .properties(height=360)
+            )
+            # 막대 위에 숫자 레이블 추가
+            labels = alt.Chart(df_counts).mark_text(dy=-8, color="black").encode(
+                x=alt.X("category:N", sort="-y"),
+                y=alt.Y("count:Q"),
+                text=alt.Text("count:Q")
+            )
+            st.altair_chart(bar + labels, use_container_width=True)
+    else:
+        st.info("아직 제출된 항목이 없어 카테고리 통계를 표시할 수 없습니다.")
 
-    # 통합 제목 (파이 + 바 한 번에)
-    st.markdown("### 📊 카테고리별 질문 현황")
-    col1, col2 = st.columns([1,1])
 
-    # 일관된 색상 스케일 사용
-    color_scale = alt.Scale(domain=df_counts["category"].tolist(), scheme="category10")
+category_overview()
 
-    with col1:
-        pie = (
-            alt.Chart(df_counts)
-            .mark_arc(innerRadius=60)
-            .encode(
-                theta=alt.Theta("count:Q"),
-                color=alt.Color("category:N", scale=color_scale, legend=alt.Legend(title="카테고리")),
-                tooltip=[alt.Tooltip("category:N", title="카테고리"),
-                         alt.Tooltip("count:Q", title="건수"),
-                         alt.Tooltip("percent:Q", title="비율(%)")]
-            )
-            .properties(height=360)
-        )
-        st.altair_chart(pie, use_container_width=True)
 
-    with col2:
-        bar = (
-            alt.Chart(df_counts)
-            .mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
-            .encode(
-                x=alt.X("category:N", sort="-y", title=None),
-                y=alt.Y("count:Q", title="제출 수"),
-                color=alt.Color("category:N", scale=color_scale, legend=None),
-                tooltip=[alt.Tooltip("category:N", title="카테고리"),
-                         alt.Tooltip("count:Q", title="건수")]
-            )
-            .properties(height=360)
-        )
-        # 막대 위에 숫자 레이블 추가
-        labels = alt.Chart(df_counts).mark_text(dy=-8, color="black").encode(
-            x=alt.X("category:N", sort="-y"),
-            y=alt.Y("count:Q"),
-            text=alt.Text("count:Q")
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def submission_timeline():
+    # 최근 15분 분당 제출 추이 (메모리 링 버퍼 — 새로 들어온 행만 반영)
+    timeline = get_timeline()
+    timeline.sync(current_generation(), active_board_id())
+    categories = ["Vocabulary", "Grammar", "Reading", "Else"]
+    df_rate = pd.DataFrame(timeline.series(categories), columns=["minute", "category", "count"])
+    if df_rate["count"].sum() == 0:
+        return
+    df_rate["time"] = pd.to_datetime(df_rate["minute"], unit="s", utc=True)
+
+    st.markdown(f"### ⏱️ 최근 {timeline.window}분 제출 추이")
+    area = (
+        alt.Chart(df_rate)
+        .mark_area(opacity=0.8, interpolate="monotone")
+        .encode(
+            x=alt.X("time:T", title=None, axis=alt.Axis(format="%H:%M")),
+            y=alt.Y("count:Q", stack="zero", title="분당 제출 수", axis=alt.Axis(format="d")),
+            color=alt.Color("category:N", scale=alt.Scale(domain=categories, scheme="category10"), legend=alt.Legend(title="카테고리")),
+            tooltip=[alt.Tooltip("time:T", title="시각", format="%H:%M"),
+                     alt.Tooltip("category:N", title="카테고리"),
+                     alt.Tooltip("count:Q", title="건수")]
         )
-        st.altair_chart(bar + labels, use_container_width=True)
-else:
-    st.info("아직 제출된 항목이 없어 카테고리 통계를 표시할 수 없습니다.")
+        .properties(height=220)
+    )
+    st.altair_chart(area, use_container_width=True)
+
+
+submission_timeline()
 
 
 # 보기용(필터) 카테고리 선택 — 결과 파트 시작
@@ -233,164 +236,177 @@ view_category = st.selectbox("보기용 카테고리 선택", ["All", "Vocabular
 
 # 제출된 키워드 목록을 접힘(버튼) 방식으로 보여주기 — Inventory tracker 스타일 표
 # ...existing code...
-with st.expander("제출된 키워드 목록 보기", expanded=False):
-    items = get_keywords(category=view_category)
-    if items:
-        table_rows = []
-        for r in items:
-            # r 구조: (id, keyword, category, grade, class_num, student_no, student_name, note, ts)
-            _id, kw, cat, grade_db, class_db, no_db, name_db, note_db, ts = r
-            table_rows.append({
-                "카테고리": cat,
-                "키워드": kw,
-                "부연설명": note_db,
-                # "제출시간": ts  # 표시에서 제외됨
-            })
-        df_table = pd.DataFrame(table_rows)
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def keyword_board(view_category: str):
+    # 세션마다 (보드, 카테고리)별 LiveFeed를 유지: rerun 시 새로 제출된 행만 가져와 덧붙임
+    board_id = active_board_id()
+    feed_key = (board_id, view_category)
+    feeds = st.session_state.setdefault("live_feeds", {})
+    if feed_key not in feeds:
+        # 새 보드가 열리면 이전 보드의 피드는 버림
+        feeds.clear()
+        feeds[feed_key] = LiveFeed(view_category, board_id=board_id)
+    feed = feeds[feed_key]
+    feed.sync(current_generation())
+
+    # 표 DataFrame도 피드 내용이 바뀐 경우에만 다시 만듦
+    table_cache = st.session_state.setdefault("live_table_cache", {})
+    cached = table_cache.get(feed_key)
+    if cached is None or cached[0] != feed.version:
+        df_table = pd.DataFrame(
+            [(cat, kw, note_db) for (_id, kw, cat, note_db) in feed.rows],
+            columns=["카테고리", "키워드", "부연설명"],
+        )
         # 인덱스를 1부터 시작하도록 설정
         df_table.index = range(1, len(df_table) + 1)
         df_table.index.name = "No"
-        cols_order = ["카테고리", "키워드", "부연설명"]  # 제출시간 제거
-        st.dataframe(df_table[cols_order], use_container_width=True)
+        table_cache[feed_key] = (feed.version, df_table)
     else:
-        st.info("해당 카테고리에 제출된 항목이 없습니다.")
-# ...existing code...
-
-# -----------------------------
-# 빈도 집계 및 시각화 추가 (워드클라우드 먼저, 그 다음 빈도)
-# -----------------------------
-st.markdown("---")
-st.subheader(f"🔍 자주 언급한 질문 키워드")
+        df_table = cached[1]
+
+    with st.expander("제출된 키워드 목록 보기", expanded=False):
+        if not df_table.empty:
+            cols_order = ["카테고리", "키워드", "부연설명"]  # 제출시간 제거
+            st.dataframe(df_table[cols_order], use_container_width=True)
+        else:
+            st.info("해당 카테고리에 제출된 항목이 없습니다.")
+    # ...existing code...
+
+    # -----------------------------
+    # 빈도 집계 및 시각화 추가 (워드클라우드 먼저, 그 다음 빈도)
+    # -----------------------------
+    st.markdown("---")
+    st.subheader(f"🔍 자주 언급한 질문 키워드")
 
-# 키워드 문자열만 추출 (필터 적용된 items 사용)
-keywords = [kw for (_id, kw, _cat, _grade, _class, _no, _name, _note, _ts) in items]
+    # 키워드별 빈도 (피드가 바뀐 경우에만 집계 테이블에서 다시 읽음 — 최근 500건 제한 없이 전체 기준)
+    freq = dict(feed.keyword_counts)
 
-if keywords:
-    freq = Counter(keywords)
-    df = pd.DataFrame(freq.items(), columns=["keyword", "count"])
-    df = df.sort_values("count", ascending=False).reset_index(drop=True)
+    if freq:
+        df = pd.DataFrame(freq.items(), columns=["keyword", "count"])
+        df = df.sort_values("count", ascending=False, kind="stable").reset_index(drop=True)
 
     
-    # 1) 워드클라우드 표시 (Top 키워드 제거, 기본형)
-    st.markdown("#### ")
-    if WORDCLOUD_AVAILABLE:
-        freq_dict = dict(freq)
-
-        # 기본 직사각형 워드클라우드
-        wc = WordCloud(
-            width=700,
-            height=420,
-            background_color="white",
-            colormap="plasma",
-            prefer_horizontal=0.9,
-            contour_width=0,
-            font_path=FONT_PATH if ('FONT_PATH' in globals() and FONT_PATH) else None,
-            random_state=42
-        ).generate_from_frequencies(freq_dict)
-
-        img = wc.to_image()
-
-        # 제목 및 워드클라우드 표시
-        st.image(img, use_container_width=True)
-
-        st.markdown(
-            """
-            <div style='height:8px;'></div>
-            """,
-            unsafe_allow_html=True
-        )
-        st.info('💬 키워드 버튼을 클릭하면 해당 키워드의 부연 설명을 볼 수 있어요.')
-        st.markdown(
-            """
-            <div style='height:12px;'></div>
-            """,
-            unsafe_allow_html=True
-        )
+        # 1) 워드클라우드 표시 (Top 키워드 제거, 기본형)
+        st.markdown("#### ")
+        if WORDCLOUD_AVAILABLE:
+            freq_dict = dict(freq)
+
+            # 기본 직사각형 워드클라우드 (빈도표가 같으면 모든 세션이 캐시된 이미지를 공유)
+            # 새 이미지는 별도 프로세스에서 그리고, 시간 안에 끝나지 않으면 이전 이미지를 표시
+            img, fresh = render_wordcloud(
+                freq_dict,
+                font_path=FONT_PATH if ('FONT_PATH' in globals() and FONT_PATH) else None,
+                slot=view_category,
+            )
 
-        # 상위 4개 키워드 버튼 (워드클라우드 빈도 기반)
-        # 키워드가 4개 미만일 수 있으므로, 실제 개수에 맞게 컬럼을 준비합니다.
-        top_buttons = df.head(4)["keyword"].tolist()
-        num_buttons = len(top_buttons)
+            # 제목 및 워드클라우드 표시
+            if img is not None:
+                st.image(img, use_container_width=True)
+            if not fresh:
+                st.caption("⏳ 새 제출을 반영한 워드클라우드를 그리는 중이에요. 잠시 후 자동으로 바뀝니다." if img is not None
+                           else "⏳ 워드클라우드를 그리는 중이에요. 그동안 아래 RANKING 그래프를 확인하세요.")
+
+            st.markdown(
+                """
+                <div style='height:8px;'></div>
+                """,
+                unsafe_allow_html=True
+            )
+            st.info('💬 키워드 버튼을 클릭하면 해당 키워드의 부연 설명을 볼 수 있어요.')
+            st.markdown(
+                """
+                <div style='height:12px;'></div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            # 상위 4개 키워드 버튼 (워드클라우드 빈도 기반)
+            # 키워드가 4개 미만일 수 있으므로, 실제 개수에 맞게 컬럼을 준비합니다.
+            top_buttons = df.head(4)["keyword"].tolist()
+            num_buttons = len(top_buttons)
         
-        if "selected_word" not in st.session_state:
-            st.session_state["selected_word"] = ""
+            if "selected_word" not in st.session_state:
+                st.session_state["selected_word"] = ""
         
-        # 버튼이 1개라도 있을 때만 컬럼을 생성합니다.
-        if num_buttons > 0:
-            btn_cols = st.columns(num_buttons) # 👈 키워드 개수(최대 4개)만큼 컬럼 생성
+            # 버튼이 1개라도 있을 때만 컬럼을 생성합니다.
+            if num_buttons > 0:
+                btn_cols = st.columns(num_buttons) # 👈 키워드 개수(최대 4개)만큼 컬럼 생성
         
-            for i in range(num_buttons):
-                w = top_buttons[i]
-                with btn_cols[i]: # 👈 각 컬럼에 버튼을 배치
-                    # use_container_width=True를 제거하고 대신 CSS를 통해 100% 너비를 사용하도록 설정합니다.
-                    # (이미 상단 CSS에 설정되어 있으므로 별도 인수는 필요 없으나, 명시적으로 추가하는 것도 좋습니다.)
-                    # 단, Streamlit의 CSS가 적용되지 않을 경우를 대비해 인수는 제거한 상태로 둡니다.
-                    if st.button(
-                        w, 
-                        key=f"kwbtn_{w}", 
-                        type="secondary", # 파란색(primary) 대신 회색(secondary) 버튼 사용 권장
-                        use_container_width=True # 👈 이 인수를 추가하여 버튼이 컬럼 폭을 꽉 채우도록 합니다.
-                    ):
-                        st.session_state["selected_word"] = w
-                        # 부연 설명을 선택하면 해당 섹션이 즉시 업데이트 되도록 합니다.
-# -------------------------------------------------------------
-
-        # 선택 단어의 부연 설명 표시
-        if st.session_state.get("selected_word"):
-            selected_word = st.session_state["selected_word"]
-            # view_category 값은 st.session_state["view_category"]를 통해 연동됩니다.
-            view_cat = st.session_state.get("view_category", None) if "view_category" in st.session_state else None
-            explanations = get_explanations_by_keyword(selected_word, category=view_cat)
-            if explanations:
-                notes = [ex[3] if ex[3] else "(부연 설명 없음)" for ex in explanations]
-                df_notes = pd.DataFrame({"부연설명": notes})
-                df_notes.index = range(1, len(df_notes) + 1)
-                df_notes.index.name = "No"
-                st.dataframe(df_notes, use_container_width=True)
-            else:
-                st.info("해당 단어에 대한 부연 설명이 없습니다.")
-        # 워드클라우드 라이브러리가 없는 경우
-    else:
-        st.info("워드클라우드를 보려면 'wordcloud'와 'pillow' 패키지를 설치하세요.\n터미널에서: pip3 install wordcloud pillow")
+                for i in range(num_buttons):
+                    w = top_buttons[i]
+                    with btn_cols[i]: # 👈 각 컬럼에 버튼을 배치
+                        # use_container_width=True를 제거하고 대신 CSS를 통해 100% 너비를 사용하도록 설정합니다.
+                        # (이미 상단 CSS에 설정되어 있으므로 별도 인수는 필요 없으나, 명시적으로 추가하는 것도 좋습니다.)
+                        # 단, Streamlit의 CSS가 적용되지 않을 경우를 대비해 인수는 제거한 상태로 둡니다.
+                        if st.button(
+                            w, 
+                            key=f"kwbtn_{w}", 
+                            type="secondary", # 파란색(primary) 대신 회색(secondary) 버튼 사용 권장
+                            use_container_width=True # 👈 이 인수를 추가하여 버튼이 컬럼 폭을 꽉 채우도록 합니다.
+                        ):
+                            st.session_state["selected_word"] = w
+                            # 부연 설명을 선택하면 해당 섹션이 즉시 업데이트 되도록 합니다.
+    # -------------------------------------------------------------
+
+            # 선택 단어의 부연 설명 표시
+            if st.session_state.get("selected_word"):
+                selected_word = st.session_state["selected_word"]
+                # view_category 값은 st.session_state["view_category"]를 통해 연동됩니다.
+                view_cat = st.session_state.get("view_category", None) if "view_category" in st.session_state else None
+                explanations = get_explanations_by_keyword(selected_word, category=view_cat, board_id=board_id)
+                if explanations:
+                    notes = [ex[3] if ex[3] else "(부연 설명 없음)" for ex in explanations]
+                    df_notes = pd.DataFrame({"부연설명": notes})
+                    df_notes.index = range(1, len(df_notes) + 1)
+                    df_notes.index.name = "No"
+                    st.dataframe(df_notes, use_container_width=True)
+                else:
+                    st.info("해당 단어에 대한 부연 설명이 없습니다.")
+            # 워드클라우드 라이브러리가 없는 경우
+        else:
+            st.info("워드클라우드를 보려면 'wordcloud'와 'pillow' 패키지를 설치하세요.\n터미널에서: pip3 install wordcloud pillow")
 
     
-    st.markdown("---")
+        st.markdown("---")
 
-    # 2) 빈도순 막대그래프 
-    st.markdown("#### 🚩 질문 키워드 RANKING")
-    df_chart = df.copy()
-    order = df_chart["keyword"].tolist()
+        # 2) 빈도순 막대그래프 
+        st.markdown("#### 🚩 질문 키워드 RANKING")
+        df_chart = df.copy()
+        order = df_chart["keyword"].tolist()
 
-    color_scheme = "category20" if len(order) <= 20 else "category20"
-    kw_color_scale = alt.Scale(domain=order, scheme=color_scheme)
+        color_scheme = "category20" if len(order) <= 20 else "category20"
+        kw_color_scale = alt.Scale(domain=order, scheme=color_scheme)
 
-    bar = (
-        alt.Chart(df_chart)
-        .mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
-        .encode(
-            x=alt.X("keyword:N", sort=order, title="키워드"),
-            y=alt.Y("count:Q", title="빈도", axis=alt.Axis(format="d")),
-            color=alt.Color("keyword:N", scale=kw_color_scale, legend=None),
-            tooltip=[alt.Tooltip("keyword:N", title="키워드"),
-                     alt.Tooltip("count:Q", title="건수", format=".0f")]
+        bar = (
+            alt.Chart(df_chart)
+            .mark_bar(cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
+            .encode(
+                x=alt.X("keyword:N", sort=order, title="키워드"),
+                y=alt.Y("count:Q", title="빈도", axis=alt.Axis(format="d")),
+                color=alt.Color("keyword:N", scale=kw_color_scale, legend=None),
+                tooltip=[alt.Tooltip("keyword:N", title="키워드"),
+                         alt.Tooltip("count:Q", title="건수", format=".0f")]
+            )
+            .properties(height=360)
         )
-        .properties(height=360)
-    )
 
-    labels = (
-        alt.Chart(df_chart)
-        .mark_text(dy=-8, color="black", fontSize=12)
-        .encode(
-            x=alt.X("keyword:N", sort=order),
-            y=alt.Y("count:Q"),
-            text=alt.Text("count:Q", format=".0f")
+        labels = (
+            alt.Chart(df_chart)
+            .mark_text(dy=-8, color="black", fontSize=12)
+            .encode(
+                x=alt.X("keyword:N", sort=order),
+                y=alt.Y("count:Q"),
+                text=alt.Text("count:Q", format=".0f")
+            )
         )
-    )
 
-    st.altair_chart(bar + labels, use_container_width=True)
+        st.altair_chart(bar + labels, use_container_width=True)
+
+    else:
+        st.info("집계할 키워드가 없습니다. 먼저 키워드를 제출해 주세요.")
 
-else:
-    st.info("집계할 키워드가 없습니다. 먼저 키워드를 제출해 주세요.")
+
+keyword_board(view_category)
 
 # -----------------------------
 # 보드 초기화 섹션 (이 페이지에 남겨둠)
@@ -398,25 +414,22 @@ else:
 st.markdown("---")
 with st.container():
     st.subheader("보드 초기화")
-    confirm = st.checkbox("정말 초기화할래요? (그래프/표/입력 모두 비워짐)")
+    board = get_active_board()
+    if board:
+        st.caption(f"현재 보드: {board[1] or f'보드 #{board[0]}'} (시작: {str(board[2])[:16].replace('T', ' ')})")
+    new_board_name = st.text_input("새 보드 이름 (예: 2-3반 5주차)", key="new_board_name")
+    confirm = st.checkbox("정말 초기화할래요? (그래프/표/입력 모두 비워짐 — 이전 제출은 Teacher's Page에서 계속 볼 수 있어요)")
 
     if st.button("🧹 완전 초기화", use_container_width=True, disabled=not confirm):
         try:
-            # DB 비우기 (테이블 전체 삭제)
-            with conn:
-                conn.execute("DELETE FROM keywords;")
-
-            # (선택) WAL 체크포인트/용량 정리
-            try:
-                conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
-            except Exception:
-                pass
+            # 새 보드 열기 (기존 행은 지우지 않고 보드만 바꿈 — 데이터 양과 상관없이 즉시 끝남)
+            open_board(new_board_name.strip())
 
             # 세션/캐시 비우기 (첫 페이지의 입력창도 같이 초기화)
             keys_to_reset = [
                 "keyword_input","note_input","selected_word","msg","msg_type",
                 "view_category","category_select","grade_select","class_select",
-                "student_no_select","student_name"
+                "student_no_select","student_name","live_feeds","live_table_cache","new_board_name"
             ]
             for k in keys_to_reset:
                 st.session_state.pop(k, None)
@@ -426,8 +439,9 @@ with st.container():
                 st.cache_resource.clear()
             except Exception:
                 pass
+            clear_cache()
 
-            st.success("✅ 모든 데이터가 초기화되었습니다. (DB+세션)")
+            st.success("✅ 새 보드가 열렸습니다. (이전 보드는 Teacher's Page에서 조회)")
             st.rerun()  # 즉시 빈 상태로 다시 렌더링
 
         except Exception as e:
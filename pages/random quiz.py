@@ -1,9 +1,9 @@
 import streamlit as st
-import sqlite3
 import pandas as pd
 from pathlib import Path
 import random
 import json
+import os
 
 # Google GenAI SDK 사용을 위한 임포트
 try:
@@ -11,7 +11,7 @@ try:
     from google.genai.errors import APIError
     GEMINI_AVAILABLE = True
 except ImportError:
-    st.error("Google GenAI 라이브러리가 설치되지 않았습니다. 'pip install google-genai' 명령어로 설치해주세요.")
+    # 라이브러리가 없으면 제출 데이터로 만드는 템플릿 퀴즈를 씀 (liveboard.template_quiz)
     GEMINI_AVAILABLE = False
 
 
@@ -23,46 +23,58 @@ except ImportError:
 # 레이아웃을 wide로 변경하여 퀴즈 화면을 넓게 사용할 것을 권장합니다.
 st.set_page_config(page_title="랜덤 퀴즈 생성", layout="wide") 
 
-# DB 경로 설정 (pages/random_quiz.py 기준)
-DB_PATH = Path(__file__).parent.parent / "keywords.db"
+# DB 접근은 공용 모듈에서 (공유 연결 풀 + 세션 간 공유 결과 캐시)
+from liveboard.queries import get_unique_keywords
+from liveboard.ai_gate import get_ai_gate
+from liveboard.fake_genai import FakeGenAIClient
+from liveboard.quiz_bank import QUIZ_TITLE, bank_size, extend_quiz, job_states, missing_keywords, sample_quiz, start_fill
+from liveboard.template_quiz import template_quiz
 
-def init_db():
-    conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL;")
-    return conn
-
-conn = init_db()
-
-# 데이터 조회 함수: 모든 고유 키워드를 가져옵니다.
-def get_unique_keywords():
-    cur = conn.cursor()
-    cur.execute("SELECT DISTINCT keyword FROM keywords")
-    rows = cur.fetchall()
-    return [row[0] for row in rows]
+# LIVEBOARD_AI_CLIENT=fake 이면 API 키/네트워크 없이 가짜 클라이언트로 생성 흐름을 확인할 수 있음
+AI_CLIENT = os.environ.get("LIVEBOARD_AI_CLIENT", "gemini").lower()
+GENERATION_TIMEOUT_MS = 30_000  # AI 호출 한 번의 제한 시간 (넘으면 관문에서 재시도)
+STREAM_POLL_SECONDS = 0.5       # 생성 중인 배치를 확인하는 간격
 
 # ------------------------------------
 # 📌 2. 퀴즈 생성 함수 (Gemini Pro 사용)
 # ------------------------------------
 
-# @st.cache_data를 사용하여 퀴즈 생성 비용 절감 (키워드가 변경되지 않으면 캐시 사용)
-@st.cache_data(show_spinner="AI가 질문 키워드 기반으로 퀴즈를 생성하는 중...")
-def generate_quiz_with_ai(keyword_list_str, num_questions):
+# Gemini 클라이언트는 프로세스 전체에서 하나를 공유 (세션/요청마다 새로 만들지 않음)
+@st.cache_resource(show_spinner=False)
+def get_genai_client(api_key):
+    return genai.Client(api_key=api_key, http_options={"timeout": GENERATION_TIMEOUT_MS})
+
+
+@st.cache_resource(show_spinner=False)
+def get_fake_client():
+    return FakeGenAIClient(timeout=GENERATION_TIMEOUT_MS / 1000)
+
+
+def get_quiz_client():
+    """퀴즈 생성에 쓸 클라이언트. 반환: (클라이언트, None) 또는 쓸 수 없으면 (None, 이유)"""
+    if get_ai_gate().over_budget():
+        return None, "AI 요청이 많이 밀려 있어요."
+    if AI_CLIENT == "fake":
+        return get_fake_client(), None
     if not GEMINI_AVAILABLE:
-        st.error("Google GenAI 라이브러리가 없어 퀴즈를 생성할 수 없습니다.")
-        return None
-    
+        return None, "Google GenAI 라이브러리가 설치되어 있지 않아요. (pip install google-genai)"
     try:
         # Streamlit Secrets에서 API 키 가져오기
-        client = genai.Client(api_key=st.secrets["gemini"]["api_key"])
+        return get_genai_client(st.secrets["gemini"]["api_key"]), None
     except Exception:
-        st.error("Gemini API 키를 Streamlit Secrets에 설정해주세요. (gemini.api_key)")
-        return None
-        
+        return None, "Gemini API 키가 Streamlit Secrets에 없어요. (gemini.api_key)"
+
+
+# 문제 은행(liveboard.quiz_bank)에 없는 새 키워드 묶음에 대해서만 호출됨
+# 키워드마다 문제를 만들고, 각 문제에 어떤 키워드의 문제인지("keyword")를 함께 받음
+# AI 호출 관문의 작업 스레드에서 실행되므로 st.* 를 호출하지 않고 오류는 예외로 알림
+def generate_questions_with_ai(client, keywords, num_questions):
+    per_keyword = max(1, num_questions // max(1, len(keywords)))
     prompt = f"""
-    당신은 훌륭한 영어 교사입니다. 다음 키워드 목록을 활용하여 {num_questions}개의 객관식 퀴즈를 생성해 주세요.
-    각 퀴즈는 키워드의 의미나 용법에 대한 질문이어야 합니다.
+    당신은 훌륭한 영어 교사입니다. 다음 키워드마다 {per_keyword}개씩, 모두 {num_questions}개의 객관식 퀴즈를 생성해 주세요.
+    각 퀴즈는 해당 키워드의 의미나 용법에 대한 질문이어야 합니다.
     
-    키워드 목록: {keyword_list_str}
+    키워드 목록: {", ".join(keywords)}
     
     ---
     
@@ -75,6 +87,7 @@ def generate_quiz_with_ai(keyword_list_str, num_questions):
          "questions": [
            {{
              "q_num": 1,
+             "keyword": "이 문제가 다루는 키워드 (목록의 표기 그대로)",
              "question": "질문 내용...",
              "options": ["1. 보기 1", "2. 보기 2", "3. 보기 3", "4. 보기 4"],
              "answer": 2
@@ -84,26 +97,67 @@ def generate_quiz_with_ai(keyword_list_str, num_questions):
        }}
     """
     
-    try:
-        response = client.models.generate_content(
-            model='gemini-2.5-flash', # 더 빠르고 비용 효율적인 모델 사용
-            contents=prompt,
-            config={
-                "response_mime_type": "application/json", # JSON 출력 형식 강제
-                "temperature": 0.7
-            }
-        )
-        
-        # response.text에 JSON 문자열이 포함되어 있습니다.
-        return json.loads(response.text)
-        
-    except APIError as e:
-        st.error(f"Gemini API 오류: {e}")
-        st.info("API 키, 요금제 상태, 사용량 제한 등을 확인해주세요.")
-        return None
-    except Exception as e:
-        st.error(f"퀴즈 생성 중 오류가 발생했습니다: {e}")
-        return None
+    response = client.models.generate_content(
+        model='gemini-2.5-flash', # 더 빠르고 비용 효율적인 모델 사용
+        contents=prompt,
+        config={
+            "response_mime_type": "application/json", # JSON 출력 형식 강제
+            "temperature": 0.7
+        }
+    )
+
+    # response.text에 JSON 문자열이 포함되어 있습니다.
+    return json.loads(response.text)
+
+
+def show_generation_progress(placeholder, states):
+    # 같은 새 키워드를 요청한 다른 세션과 합쳐서 기다리는 중일 수 있음 (중복 호출 없음)
+    total = len(states)
+    done = states.count(None)
+    running = states.count("running")
+    waiting = total - done - running
+    placeholder.info(
+        f"⏳ AI 문제 생성 중: 완료 {done}/{total} · 생성 중 {running} · 대기 {waiting}\n\n"
+        "먼저 도착한 문제부터 아래에 추가돼요. 나머지 문제도 잠시만 기다려 주세요."
+    )
+
+
+def describe_generation_error(e):
+    if GEMINI_AVAILABLE and isinstance(e, APIError):
+        return f"Gemini API 오류: {e} (API 키, 요금제 상태, 사용량 제한 등을 확인해주세요.)"
+    return f"퀴즈 생성 중 오류가 발생했습니다: {e}"
+
+
+# 생성 중인 배치를 주기적으로 확인해서, 끝난 배치의 문제를 quiz_data 뒤에 바로 이어 붙임
+# (전체가 끝날 때까지 기다리지 않고 먼저 온 문제부터 풀 수 있음)
+@st.fragment(run_every=STREAM_POLL_SECONDS)
+def stream_new_questions(all_keywords):
+    jobs = st.session_state["quiz_jobs"]
+    finished = [job for job in jobs if job[2].done()]
+    if not finished:
+        show_generation_progress(st, job_states(jobs))
+        return
+
+    quiz = st.session_state["quiz_data"]
+    target = st.session_state["quiz_target"]
+    for _key, batch, fut in finished:
+        error = fut.exception()
+        if error is not None:
+            st.session_state["quiz_errors"].append(describe_generation_error(error))
+            continue
+        # 새 키워드 하나당 한 문제씩 (남은 자리만큼)
+        room = min(len(batch), target - len(quiz["questions"]))
+        if room > 0:
+            extend_quiz(quiz, sample_quiz(batch, room), target)
+
+    st.session_state["quiz_jobs"] = [job for job in jobs if not any(job is f for f in finished)]
+    if not st.session_state["quiz_jobs"] and len(quiz["questions"]) < target:
+        # 실패한 배치의 빈자리는 은행에 있던 다른 문제로, 그래도 모자라면 템플릿 문제로 채움
+        asked = {q["question"] for q in quiz["questions"]}
+        extend_quiz(quiz, sample_quiz(all_keywords, target - len(quiz["questions"]), exclude=asked), target)
+        extend_quiz(quiz, template_quiz(target), target)
+    st.rerun()
+
 
 # ------------------------------------
 # 📌 3. 페이지 렌더링 (나머지 코드는 그대로 사용)
@@ -116,6 +170,12 @@ if "answers" not in st.session_state:
     st.session_state["answers"] = {}
 if "submitted" not in st.session_state:
     st.session_state["submitted"] = False
+if "quiz_jobs" not in st.session_state:
+    st.session_state["quiz_jobs"] = []
+if "quiz_errors" not in st.session_state:
+    st.session_state["quiz_errors"] = []
+if "quiz_notices" not in st.session_state:
+    st.session_state["quiz_notices"] = []
 
 st.markdown("<h1 style='text-align:center; margin-bottom:0.25rem;'>🎲 질문 키워드 랜덤 퀴즈 🎲</h1>", unsafe_allow_html=True)
 st.markdown("---")
@@ -125,12 +185,11 @@ st.markdown("---")
 # 퀴즈 설정 및 생성
 # ------------------------------------
 unique_keywords = get_unique_keywords()
-keyword_list_str = ", ".join(unique_keywords)
 
 if not unique_keywords:
     st.info("아직 제출된 키워드가 없습니다. 퀴즈를 생성할 수 없습니다.")
 else:
-    st.info(f"현재 총 {len(unique_keywords)}개의 질문 키워드가 있습니다. 이를 기반으로 퀴즈를 생성합니다.")
+    st.info(f"현재 총 {len(unique_keywords)}개의 질문 키워드가 있습니다. 이를 기반으로 퀴즈를 생성합니다. (문제 은행: {bank_size(unique_keywords)}문제)")
     
     # 퀴즈 설정
     col_num, col_btn = st.columns([3, 1])
@@ -143,9 +202,38 @@ else:
         st.session_state["quiz_data"] = None
         st.session_state["answers"] = {}
         st.session_state["submitted"] = False
+        st.session_state["quiz_jobs"] = []
+        st.session_state["quiz_errors"] = []
+        st.session_state["quiz_notices"] = []
+        st.session_state["quiz_target"] = num_questions
         
-        # 새 퀴즈 생성 및 저장 (캐시를 사용)
-        quiz_json = generate_quiz_with_ai(keyword_list_str, num_questions)
+        # 은행에 없는 새 키워드만 작은 배치로 나눠 AI에 병렬로 요청 (기다리지 않고 바로 진행)
+        new_keywords = missing_keywords(unique_keywords)
+        reserved = 0
+        if new_keywords:
+            client, reason = get_quiz_client()
+            if client is not None:
+                st.session_state["quiz_jobs"] = start_fill(
+                    new_keywords, lambda keywords, n: generate_questions_with_ai(client, keywords, n)
+                )
+                # 새 키워드 문제가 들어갈 자리를 남겨 둠 (도착하는 대로 채움)
+                reserved = min(num_questions, len(new_keywords))
+            else:
+                st.session_state["quiz_notices"].append(f"{reason} 새 키워드는 제출된 내용으로 바로 만든 복습 문제로 대신할게요.")
+
+        # 은행에 이미 있는 문제로 먼저 시작 (DB 조회 한 번)
+        quiz_json = {"quiz_title": QUIZ_TITLE, "questions": []}
+        if num_questions > reserved:
+            extend_quiz(quiz_json, sample_quiz(unique_keywords, num_questions - reserved), num_questions)
+        # AI를 쓸 수 없으면 남은 자리는 템플릿 문제로 바로 채움 (DB 조회 한 번, 몇 ms)
+        if not st.session_state["quiz_jobs"] and len(quiz_json["questions"]) < num_questions:
+            template = template_quiz(num_questions)
+            if template is not None and not quiz_json["questions"]:
+                quiz_json["quiz_title"] = template["quiz_title"]
+            extend_quiz(quiz_json, template, num_questions)
+        if not quiz_json["questions"] and not st.session_state["quiz_jobs"]:
+            st.warning("문제 은행에 아직 문제가 없어 퀴즈를 만들 수 없습니다.")
+            st.stop()
         st.session_state["quiz_data"] = quiz_json
         
         # 퀴즈 생성 후 바로 표시되도록 Rerun
@@ -155,12 +243,23 @@ else:
 # 퀴즈 풀기 및 채점
 # ------------------------------------
 
+for message in st.session_state["quiz_notices"]:
+    st.info(message)
+for message in st.session_state["quiz_errors"]:
+    st.error(message)
+
 if st.session_state["quiz_data"]:
     quiz_data = st.session_state["quiz_data"]
     st.subheader(f"📝 {quiz_data['quiz_title']}")
+    if st.session_state["quiz_jobs"]:
+        stream_new_questions(unique_keywords)
+    elif not quiz_data["questions"]:
+        st.warning("문제 은행에 아직 문제가 없어 퀴즈를 만들 수 없습니다.")
+        st.stop()
     st.markdown("---")
 
     questions = quiz_data['questions']
+    generating = bool(st.session_state["quiz_jobs"])
     
     # 퀴즈 폼 시작
     with st.form(key="quiz_form"):
@@ -169,7 +268,8 @@ if st.session_state["quiz_data"]:
             question_text = f"**Q{q['q_num']}.** {q['question']}"
             
             # 보기 텍스트만 추출
-            options_text = [option.split(".")[1].strip() for option in q['options']]
+            # (보기 내용에 "."이 들어 있을 수 있으므로 첫 번째 "."에서만 자름)
+            options_text = [option.split(".", 1)[1].strip() for option in q['options']]
             
             # 정답을 알고 있는 경우 (제출 후)
             is_correct = None
@@ -216,7 +316,8 @@ if st.session_state["quiz_data"]:
 
 
         # 제출 버튼
-        submitted = st.form_submit_button("제출하고 채점하기", disabled=st.session_state["submitted"])
+        # 아직 생성 중인 문제가 있으면 모두 도착한 뒤에 제출
+        submitted = st.form_submit_button("제출하고 채점하기", disabled=st.session_state["submitted"] or generating)
         
         if submitted:
             # 모든 질문에 답했는지 확인
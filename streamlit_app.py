@@ -1,7 +1,5 @@
 # ...existing code...
 import streamlit as st
-import sqlite3
-from datetime import datetime
 from pathlib import Path
 from collections import Counter
 
@@ -127,86 +125,8 @@ st.set_page_config(page_title="Exit Ticket Live Board", layout="centered")
 st.markdown("<h1 style='text-align:center; margin-bottom:0.25rem;'>💡 Exit Ticket Live Board 💡</h1>", unsafe_allow_html=True)
 # ...existing code...
 
-# DB 경로
-DB_PATH = Path(__file__).parent / "keywords.db"
-
-def init_db():
-    conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL;")
-
-    # 테이블 생성 (week는 없어도 됨 — 아래에서 조건부로 추가)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS keywords (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            keyword TEXT NOT NULL,
-            category TEXT NOT NULL DEFAULT 'Else',
-            grade TEXT NOT NULL DEFAULT '2학년',
-            class_num INTEGER NOT NULL DEFAULT 1,
-            student_no INTEGER NOT NULL DEFAULT 1,
-            student_name TEXT NOT NULL DEFAULT '',
-            note TEXT NOT NULL DEFAULT '',
-            ts TEXT NOT NULL
-        )
-    """)
-    conn.commit()
-
-    # ✅ 여기부터 추가: 컬럼 존재 여부 점검 후 없으면 추가
-    cur = conn.cursor()
-    cur.execute("PRAGMA table_info(keywords)")
-    cols = [r[1] for r in cur.fetchall()]
-
-    if "grade" not in cols:
-        conn.execute("ALTER TABLE keywords ADD COLUMN grade TEXT DEFAULT '2학년'")
-    if "class_num" not in cols:
-        conn.execute("ALTER TABLE keywords ADD COLUMN class_num INTEGER DEFAULT 1")
-    if "student_no" not in cols:
-        conn.execute("ALTER TABLE keywords ADD COLUMN student_no INTEGER DEFAULT 1")
-    if "student_name" not in cols:
-        conn.execute("ALTER TABLE keywords ADD COLUMN student_name TEXT DEFAULT ''")
-    if "note" not in cols:
-        conn.execute("ALTER TABLE keywords ADD COLUMN note TEXT DEFAULT ''")
-    # 🔽 바로 여기! week 컬럼 추가
-    if "week" not in cols:
-        conn.execute("ALTER TABLE keywords ADD COLUMN week INTEGER")
-    # ▲ week 컬럼은 NULL 허용: 과거 데이터엔 비워두고, 이후 저장 시 채우면 됨
-
-    conn.commit()
-    return conn
-
-
-conn = init_db()
-
-def add_keyword(kw: str, category: str, grade: str, class_num: int, student_no: int, student_name: str, note: str, week: int | None):
-    # 한국 시간으로 저장 권장
-    ts = datetime.now().astimezone().isoformat()
-    with conn:
-        conn.execute(
-            "INSERT INTO keywords (keyword, category, grade, class_num, student_no, student_name, note, ts, week) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (kw, category, grade, class_num, student_no, student_name, note, ts, week)
-        )
-
-
-def get_keywords(limit: int = 500, category: str | None = None):
-    cur = conn.cursor()
-    if category and category != "All":
-        cur.execute("SELECT id, keyword, category, grade, class_num, student_no, student_name, note, ts FROM keywords WHERE category = ? ORDER BY id DESC LIMIT ?", (category, limit))
-    else:
-        cur.execute("SELECT id, keyword, category, grade, class_num, student_no, student_name, note, ts FROM keywords ORDER BY id DESC LIMIT ?", (limit,))
-    rows = cur.fetchall()
-    return list(reversed(rows))
-
-# 새: 키워드로 부연설명 조회
-def get_explanations_by_keyword(keyword: str, category: str | None = None, limit: int = 200):
-    cur = conn.cursor()
-    if category and category != "All":
-        cur.execute("""SELECT student_name, class_num, student_no, note, ts
-                       FROM keywords WHERE keyword = ? AND category = ? ORDER BY id DESC LIMIT ?""",
-                    (keyword, category, limit))
-    else:
-        cur.execute("""SELECT student_name, class_num, student_no, note, ts
-                       FROM keywords WHERE keyword = ? ORDER BY id DESC LIMIT ?""",
-                    (keyword, limit))
-    return cur.fetchall()
+# DB 접근은 공용 모듈에서 (프로세스 전체가 하나의 연결 풀을 공유)
+from liveboard.db import add_keyword, current_week
 
 # ...existing code...
 # 세션 상태 초기화 (입력창 제어용)
@@ -224,9 +144,9 @@ if "student_no_select" not in st.session_state:
     st.session_state["student_no_select"] = "1번"
 if "student_name" not in st.session_state:
     st.session_state["student_name"] = ""
-# 추가: 수업 주차 초기값 (1~17)
+# 추가: 수업 주차 초기값 (1~17) — 학사 일정이 등록되어 있으면 오늘 날짜의 주차
 if "week_select" not in st.session_state:
-    st.session_state["week_select"] = 1
+    st.session_state["week_select"] = current_week() or 1
 # 추가: Reading 선택 시 사용할 지문/문장 선택 기본값
 if "reading_passage" not in st.session_state:
     st.session_state["reading_passage"] = 1
@@ -318,8 +238,14 @@ def submit_callback():
         # week_select 값 가져오기
         week_val = st.session_state.get("week_select", None)
         
-        # week 포함해 저장
-        add_keyword(kw, cat, grade_val, class_num, student_no, student_name_val, note_text, week_val)
+        # week 포함해 저장 (쓰기 큐에서 실제로 커밋될 때까지 대기)
+        try:
+            add_keyword(kw, cat, grade_val, class_num, student_no, student_name_val, note_text, week_val)
+        except Exception:
+            # 저장 실패 시 입력 내용은 그대로 두고 다시 시도하도록 안내
+            st.session_state["msg"] = "제출이 저장되지 않았어요. 잠시 후 다시 제출해 주세요."
+            st.session_state["msg_type"] = "warning"
+            return
 
         # 입력창 비우기
         st.session_state[input_key] = ""